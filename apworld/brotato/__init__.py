@@ -1,31 +1,26 @@
 import logging
-from dataclasses import asdict
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
-from BaseClasses import Item, MultiWorld, Region, Tutorial
+from BaseClasses import CollectionState, Item, Location, MultiWorld, Region, Tutorial
 from Options import OptionGroup
 from worlds.AutoWorld import WebWorld, World
 
-from . import options  # So we don't need to import every option class when defining option groups
-from .characters import get_available_and_starting_characters
-from .constants import (
-    MAX_SHOP_SLOTS,
-    RUN_COMPLETE_LOCATION_TEMPLATE,
-)
-from .item_weights import create_items_from_weights
-from .items import BrotatoItem, ItemName, filler_items, item_name_groups, item_name_to_id, item_table
+from . import items, options  # So we don't need to import every option class when defining option groups
+from .constants import MAX_SHOP_SLOTS
+from .items import BrotatoItem, ItemName, filler_items, item_name_groups, item_name_to_id
 from .locations import location_name_groups, location_name_to_id
-from .loot_crates import (
-    BrotatoLootCrateGroup,
-    build_loot_crate_groups,
-)
+from .logic import update_logic_on_collect, update_logic_on_remove
 from .options import (
     BrotatoOptions,
 )
-from .regions import create_regions
-from .rules import create_has_run_wins_rule
-from .shop_slots import get_num_shop_slot_and_lock_button_items
-from .waves import get_wave_for_each_item, get_waves_with_checks
+
+# The launcher, WebHost and every generation import all installed worlds, even when there are no Brotato slots. Only
+# import what's needed to define the world (items, locations, logic and options) here, and import the modules only used
+# when generating in the methods that use them.
+if TYPE_CHECKING:
+    from .config import BrotatoConfig
+    from .loot_crates import BrotatoLootCrateGroup
+    from .shared_data import BrotatoSharedData
 
 logger = logging.getLogger("Brotato")
 
@@ -56,6 +51,7 @@ class BrotatoWeb(WebWorld):
                 options.NumberLegendaryCrateDropLocations,
                 options.NumberLegendaryCrateDropsPerCheck,
                 options.NumberLegendaryCrateDropGroups,
+                options.LocalFillerInLootCrates,
             ],
         ),
         OptionGroup(
@@ -117,6 +113,12 @@ class BrotatoWorld(World):
     location_name_to_id: ClassVar[dict[str, int]] = location_name_to_id
     location_name_groups: ClassVar[dict[str, set[str]]] = location_name_groups
 
+    config: "BrotatoConfig"
+    """Snapshot of the option values, taken in generate_early().
+
+    Use this instead of self.options after generate_early(), it's cheaper to read from.
+    """
+
     num_wins_needed: int
     """The number of runs won needed to achieve the goal.
 
@@ -126,19 +128,19 @@ class BrotatoWorld(World):
     num_shop_slot_items: int
     num_shop_lock_button_items: int
 
-    waves_with_checks: list[int]
+    waves_with_checks: tuple[int, ...]
     """Which waves will count as locations.
 
     Calculated from player options in generate_early.
     """
 
-    common_loot_crate_groups: list[BrotatoLootCrateGroup]
+    common_loot_crate_groups: "tuple[BrotatoLootCrateGroup, ...]"
     """Information about each common loot crate group, i.e. how many crates it has and how many wins it needs.
 
     Calculated from player options in generate_early().
     """
 
-    legendary_loot_crate_groups: list[BrotatoLootCrateGroup]
+    legendary_loot_crate_groups: "tuple[BrotatoLootCrateGroup, ...]"
     """Information about each legendary loot crate group, i.e. how many crates it has and how many wins it needs.
 
     Calculated from player options in generate_early().
@@ -158,155 +160,277 @@ class BrotatoWorld(World):
     combat logic.
     """
 
-    def __init__(self, world: MultiWorld, player: int) -> None:
-        super().__init__(world, player)
+    _run_won_locations: list[Location]
+    """The "Run Won" location of each included character, set in create_regions()."""
 
-    def create_item(self, name: str | ItemName) -> BrotatoItem:
-        if isinstance(name, ItemName):
-            name = name.value
-        return item_table[self.item_name_to_id[name]].to_item(self.player)
-
-    def generate_early(self) -> None:
-        # Determine needed values from the options
-        self.waves_with_checks = get_waves_with_checks(self.options.waves_per_drop)
-
-        self._include_characters, self._starting_characters = get_available_and_starting_characters(
-            self.options.include_base_game_characters.value,
-            bool(self.options.enable_abyssal_terrors_dlc.value),
-            self.options.include_abyssal_terrors_characters.value,
-            self.options.starting_characters,
-            self.options.num_starting_characters.value,
-            self.options.num_characters.value,
-            self.random,
-        )
+    _local_filler: list[BrotatoItem]
+    """Filler items chosen in create_items() to be taken out of the item pool and placed in our own loot crate locations
+    in pre_fill().
 
-        # Clamp the number of wins needed to goal to the number of included characters, so the game isn't unwinnable.
-        self.num_wins_needed = min(self.options.num_victories.value, len(self._include_characters))
+    See the LocalFillerInLootCrates option.
+    """
 
-        # Thought: if num victories is clamped, do some of the groups become unreachable?
-        self.common_loot_crate_groups = build_loot_crate_groups(
-            self.options.num_common_crate_drops.value,
-            self.options.num_common_crate_drop_groups.value,
-            self.num_wins_needed,
-        )
-        self.legendary_loot_crate_groups = build_loot_crate_groups(
-            self.options.num_legendary_crate_drops.value,
-            self.options.num_legendary_crate_drop_groups.value,
-            self.num_wins_needed,
-        )
+    shared_data: "BrotatoSharedData"
+    """Rules shared with the other Brotato worlds in the multiworld.
 
-        self.num_shop_slot_items, self.num_shop_lock_button_items = get_num_shop_slot_and_lock_button_items(
-            self.options.num_starting_shop_slots,
-            self.options.shop_lock_buttons_mode,
-            self.options.num_starting_lock_buttons,
-        )
+    Set in stage_generate_early().
+    """
 
-        # The number of locations available, not including the "Run Won" locations, which always have "Run Won" items.
-        num_locations = sum(
-            [
-                len(self._include_characters),  # Run Won Locations
-                len(self._include_characters) * len(self.waves_with_checks),  # Wave Complete Locations
-                self.options.num_common_crate_drops.value,
-                self.options.num_legendary_crate_drops.value,
-            ]
-        )
+    def __init__(self, world: MultiWorld, player: int) -> None:
+        super().__init__(world, player)
+        self._local_filler = []
 
-        num_essential_items = sum(
-            [
-                len(self._include_characters),  # Run Won Items
-                len(self._include_characters) - len(self._starting_characters),  # The character items
-                self.num_shop_slot_items,
-                self.num_shop_lock_button_items,
-            ]
+    def create_item(self, name: str | ItemName) -> BrotatoItem:
+        return BrotatoItem(*items.item_prototypes[name], self.player)
+
+    def create_items_bulk(self, name: str | ItemName, count: int) -> list[BrotatoItem]:
+        """Create `count` copies of the same item, which is faster than calling create_item() `count` times."""
+        name_, classification, code = items.item_prototypes[name]
+        player = self.player
+        return [BrotatoItem(name_, classification, code, player) for _ in range(count)]
+
+    # generate_early, create_regions and create_items are done for every Brotato world at once in the stage_* class
+    # methods, so lookups and rules can be shared between them. Rooms can have dozens of Brotato worlds.
+    @classmethod
+    def stage_generate_early(cls, multiworld: MultiWorld) -> None:
+        from .instrumentation import instrument_stage
+        from .shared_data import BrotatoSharedData
+
+        with instrument_stage("generate_early", multiworld.seed_name) as counts:
+            # The shared data is only needed from create_regions onwards, but this is the first stage every world is in.
+            shared_data = BrotatoSharedData()
+            worlds = multiworld.get_game_worlds(cls.game)
+            for world in worlds:
+                world.shared_data = shared_data
+                world._generate_early()
+            counts["worlds"] = len(worlds)
+
+    @classmethod
+    def stage_create_regions(cls, multiworld: MultiWorld) -> None:
+        from .instrumentation import instrument_stage
+
+        with instrument_stage("create_regions", multiworld.seed_name) as counts:
+            regions: list[Region] = []
+            for world in multiworld.get_game_worlds(cls.game):
+                regions += world._create_regions()
+            multiworld.regions.extend(regions)
+            counts["regions"] = len(regions)
+            counts["locations"] = sum(len(region.locations) for region in regions)
+            counts["entrances"] = sum(len(region.exits) for region in regions)
+
+    @classmethod
+    def stage_create_items(cls, multiworld: MultiWorld) -> None:
+        from .instrumentation import instrument_stage
+
+        with instrument_stage("create_items", multiworld.seed_name) as counts:
+            item_pool: list[Item] = []
+            worlds = multiworld.get_game_worlds(cls.game)
+            for world in worlds:
+                item_pool += world._create_items()
+            multiworld.itempool += item_pool
+            counts["items"] = len(item_pool)
+            # The "Run Won" items, which are placed instead of added to the pool.
+            counts["locked_items"] = sum(len(world._run_won_locations) for world in worlds)
+
+    @classmethod
+    def stage_pre_fill(cls, multiworld: MultiWorld) -> None:
+        from .local_filler import place_local_filler
+
+        worlds = [world for world in multiworld.get_game_worlds(cls.game) if world._local_filler]
+        if not worlds:
+            return
+
+        # Item links and start_inventory_from_pool rewrite the item pool after create_items, so only place the items
+        # which are still in it. Going through the whole multiworld's pool is slow, so do it once for every world.
+        local_filler_ids = {id(item) for world in worlds for item in world._local_filler}
+        in_pool = {id(item) for item in multiworld.itempool if id(item) in local_filler_ids}
+        placed: set[int] = set()
+        for world in worlds:
+            items = [item for item in world._local_filler if id(item) in in_pool]
+            # Plando may have filled some of the crate locations, so the items which don't fit stay in the pool.
+            place_local_filler(items, world._get_local_filler_locations(), world.random)
+            placed.update(id(item) for item in items if item.location is not None)
+            world._local_filler = []
+        multiworld.itempool[:] = [item for item in multiworld.itempool if id(item) not in placed]
+
+    def _generate_early(self) -> None:
+        from .characters import select_characters
+        from .config import BrotatoConfig
+        from .generation_plan import get_generation_plan
+        from .item_weights import sample_items_from_weights
+
+        # Everything which only depends on the options is shared between worlds with the same options, so only the
+        # parts which need our random are done here.
+        self.config = BrotatoConfig.from_options(self.options)
+        plan = get_generation_plan(self.config)
+
+        self._include_characters, self._starting_characters = select_characters(
+            plan.character_candidates,
+            self.config.num_starting_characters,
+            self.config.num_characters,
+            self.random,
         )
 
-        num_nonessential_items = max(num_locations - num_essential_items, 0)
-        self.nonessential_item_counts = create_items_from_weights(
-            num_nonessential_items,
+        self.waves_with_checks = plan.waves_with_checks
+        self.num_wins_needed = plan.num_wins_needed
+        self.common_loot_crate_groups = plan.common_loot_crate_groups
+        self.legendary_loot_crate_groups = plan.legendary_loot_crate_groups
+        self.num_shop_slot_items = plan.num_shop_slot_items
+        self.num_shop_lock_button_items = plan.num_shop_lock_button_items
+
+        self.nonessential_item_counts = sample_items_from_weights(
+            plan.num_nonessential_items,
             self.random,
-            self.options.common_item_weight,
-            self.options.uncommon_item_weight,
-            self.options.rare_item_weight,
-            self.options.legendary_item_weight,
-            self.options.common_upgrade_weight,
-            self.options.uncommon_upgrade_weight,
-            self.options.rare_upgrade_weight,
-            self.options.legendary_upgrade_weight,
-            self.options.gold_weight,
-            self.options.xp_weight,
+            plan.item_names,
+            plan.item_weights,
+            legacy_sampling=bool(self.config.legacy_item_sampling),
         )
 
     def set_rules(self) -> None:
-        self.multiworld.completion_condition[self.player] = create_has_run_wins_rule(self.player, self.num_wins_needed)
+        from .instrumentation import instrument_stage
+
+        with instrument_stage("set_rules", self.multiworld.seed_name, self.player):
+            has_enough_wins = self.shared_data.rules.has_run_wins(self.player, self.num_wins_needed)
+            # num_wins_needed is always at least 1, so there should always be a rule. If not, keep the default.
+            if has_enough_wins is not None:
+                self.multiworld.completion_condition[self.player] = has_enough_wins
+
+    def _create_regions(self) -> list[Region]:
+        from .regions import create_regions
 
-    def create_regions(self) -> None:
         def create_region(region_name: str) -> Region:
             return Region(region_name, self.player, self.multiworld)
 
-        regions: list[Region] = create_regions(
+        regions, self._run_won_locations = create_regions(
             create_region,
             self._include_characters,
             self.waves_with_checks,
             self.common_loot_crate_groups,
             self.legendary_loot_crate_groups,
+            self.shared_data,
         )
+        return regions
 
-        self.multiworld.regions.extend(regions)
+    def _create_items(self) -> list[Item]:
+        """Create the items for this world's item pool and return them.
 
-    def create_items(self) -> None:
-        item_pool: list[BrotatoItem | Item] = []
+        The starting characters are precollected, and the "Run Won" items are placed, instead of being returned.
+        """
+        item_pool: list[Item] = []
 
         for character in self._include_characters:
-            character_item: BrotatoItem = self.create_item(character)
+            character_item = self.create_item(character)
             if character in self._starting_characters:
                 self.multiworld.push_precollected(character_item)
             else:
                 item_pool.append(character_item)
 
         # Create an item for each nonessential item. These are determined in generate_early().
+        local_filler_candidates: list[BrotatoItem] = []
+        keep_local_filler = self.config.local_filler_in_loot_crates > 0
         for item_name, item_count in self.nonessential_item_counts.items():
-            item_pool += [self.create_item(item_name) for _ in range(item_count)]
+            new_items = self.create_items_bulk(item_name, item_count)
+            if (
+                keep_local_filler
+                and item_name.value in self._filler_items
+                and item_name.value not in self.options.non_local_items.value
+            ):
+                local_filler_candidates += new_items
+            item_pool += new_items
 
-        item_pool += [self.create_item(ItemName.SHOP_SLOT) for _ in range(self.num_shop_slot_items)]
-        item_pool += [self.create_item(ItemName.SHOP_LOCK_BUTTON) for _ in range(self.num_shop_lock_button_items)]
+        if local_filler_candidates:
+            self._choose_local_filler(local_filler_candidates)
 
-        self.multiworld.itempool += item_pool
+        item_pool += self.create_items_bulk(ItemName.SHOP_SLOT, self.num_shop_slot_items)
+        item_pool += self.create_items_bulk(ItemName.SHOP_LOCK_BUTTON, self.num_shop_lock_button_items)
 
         # Place "Run Won" items at the Run Won locations. Do this before fill happens so
         # plandos can't place items here.
-        for character in self._include_characters:
-            item: BrotatoItem = self.create_item(ItemName.RUN_COMPLETE)
-            run_won_location = RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character)
-            self.multiworld.get_location(run_won_location, self.player).place_locked_item(item)
+        run_won_items = self.create_items_bulk(ItemName.RUN_COMPLETE, len(self._run_won_locations))
+        for run_won_location, run_won_item in zip(self._run_won_locations, run_won_items, strict=True):
+            run_won_location.place_locked_item(run_won_item)
+
+        return item_pool
 
-    def pre_fill(self) -> None:
-        pass
+    def _choose_local_filler(self, filler: list[BrotatoItem]) -> None:
+        """Choose a random selection of the filler items to place in pre_fill(), leaving them in the item pool."""
+        from .local_filler import get_num_local_filler
+
+        num_local_filler = get_num_local_filler(
+            len(filler), self.config.local_filler_in_loot_crates, len(self._get_local_filler_locations())
+        )
+        self._local_filler = self.random.sample(filler, num_local_filler)
+
+    def _get_priority_location_names(self) -> set[str]:
+        # Main.py removes the excluded locations from the priority locations, but only after create_items().
+        return self.options.priority_locations.value - self.options.exclude_locations.value
+
+    def _get_local_filler_locations(self) -> list[Location]:
+        """Our loot crate locations which the local filler can be placed in, i.e. the ones which aren't priority
+        locations.
+        """
+        from .locations import BrotatoCommonCrateLocation, BrotatoLegendaryCrateLocation
+
+        priority_locations = self._get_priority_location_names()
+        return [
+            location
+            for location in self.multiworld.get_locations(self.player)
+            if isinstance(location, BrotatoCommonCrateLocation | BrotatoLegendaryCrateLocation)
+            and location.name not in priority_locations
+        ]
+
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        changed = super().collect(state, item)
+        if changed:
+            # Keep the values the access rules check up to date. See logic.py.
+            update_logic_on_collect(state, self.player, item.name)
+        return changed
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        changed = super().remove(state, item)
+        if changed:
+            update_logic_on_remove(state, self.player, item.name)
+        return changed
 
     def get_filler_item_name(self) -> str:
         return self.random.choice(self._filler_items)
 
     def fill_slot_data(self) -> dict[str, Any]:
-        # Define outside dict for readability
-        spawn_normal_loot_crates: bool = (
-            self.options.spawn_normal_loot_crates.value == self.options.spawn_normal_loot_crates.option_true
-        )
-        wave_per_game_item: dict[int, list[int]] = get_wave_for_each_item(self.nonessential_item_counts)
-        return {
-            "deathlink": self.options.death_link.value,
-            "waves_with_checks": self.waves_with_checks,
-            "num_wins_needed": self.num_wins_needed,
-            "gold_reward_mode": self.options.gold_reward_mode.value,
-            "xp_reward_mode": self.options.xp_reward_mode.value,
-            "enable_enemy_xp": self.options.enable_enemy_xp.value == self.options.enable_enemy_xp.option_true,
-            "num_starting_shop_slots": self.options.num_starting_shop_slots.value,
-            "num_starting_shop_lock_buttons": (MAX_SHOP_SLOTS - self.num_shop_lock_button_items),
-            "spawn_normal_loot_crates": spawn_normal_loot_crates,
-            "num_common_crate_locations": self.options.num_common_crate_drops.value,
-            "num_common_crate_drops_per_check": self.options.num_common_crate_drops_per_check.value,
-            "common_crate_drop_groups": [asdict(g) for g in self.common_loot_crate_groups],
-            "num_legendary_crate_locations": self.options.num_legendary_crate_drops.value,
-            "num_legendary_crate_drops_per_check": self.options.num_legendary_crate_drops_per_check.value,
-            "legendary_crate_drop_groups": [asdict(g) for g in self.legendary_loot_crate_groups],
-            "wave_per_game_item": wave_per_game_item,
-            "enable_abyssal_terrors_dlc": self.options.enable_abyssal_terrors_dlc.value,
-        }
+        from .instrumentation import instrument_stage
+
+        with instrument_stage("fill_slot_data", self.multiworld.seed_name, self.player) as counts:
+            slot_data = self._fill_slot_data()
+            counts["slot_data_keys"] = len(slot_data)
+        return slot_data
+
+    def _fill_slot_data(self) -> dict[str, Any]:
+        from .slot_data import BrotatoSlotData
+        from .waves import encode_wave_per_game_item, get_wave_for_each_item
+
+        # Released clients only read the full lists, so only send the counts if the player asked for them.
+        compact_slot_data = bool(self.config.compact_slot_data)
+
+        return BrotatoSlotData(
+            deathlink=self.config.death_link,
+            waves_with_checks=self.waves_with_checks,
+            num_wins_needed=self.num_wins_needed,
+            gold_reward_mode=self.config.gold_reward_mode,
+            xp_reward_mode=self.config.xp_reward_mode,
+            enable_enemy_xp=self.config.enable_enemy_xp == self.options.enable_enemy_xp.option_true,
+            num_starting_shop_slots=self.config.num_starting_shop_slots,
+            num_starting_shop_lock_buttons=(MAX_SHOP_SLOTS - self.num_shop_lock_button_items),
+            spawn_normal_loot_crates=(
+                self.config.spawn_normal_loot_crates == self.options.spawn_normal_loot_crates.option_true
+            ),
+            num_common_crate_locations=self.config.num_common_crate_drops,
+            num_common_crate_drops_per_check=self.config.num_common_crate_drops_per_check,
+            common_crate_drop_groups=self.common_loot_crate_groups,
+            num_legendary_crate_locations=self.config.num_legendary_crate_drops,
+            num_legendary_crate_drops_per_check=self.config.num_legendary_crate_drops_per_check,
+            legendary_crate_drop_groups=self.legendary_loot_crate_groups,
+            wave_per_game_item=None if compact_slot_data else get_wave_for_each_item(self.nonessential_item_counts),
+            wave_per_game_item_compact=(
+                encode_wave_per_game_item(self.nonessential_item_counts) if compact_slot_data else None
+            ),
+            enable_abyssal_terrors_dlc=self.config.enable_abyssal_terrors_dlc,
+        ).to_dict()
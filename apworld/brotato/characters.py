@@ -1,5 +1,5 @@
 import random
-from collections.abc import Sequence
+from collections.abc import Iterable, Set
 from typing import NamedTuple
 
 from Options import OptionError
@@ -9,15 +9,44 @@ from .constants import (
     ALL_CHARACTERS,
     BASE_GAME_CHARACTERS,
     CHARACTER_GROUPS,
-    CharacterGroup,
 )
+from .logic import CHARACTER_MASKS
 from .options import StartingCharacters
 
 
-class CharacterGroupInfo(NamedTuple):
-    enabled: bool
-    include_characters: set[str]
-    group: CharacterGroup
+def characters_to_mask(characters: Iterable[str]) -> int:
+    """Get the mask of the given characters, ignoring any names which aren't characters. See CHARACTER_MASKS."""
+    mask = 0
+    for character in characters:
+        mask |= CHARACTER_MASKS.get(character, 0)
+    return mask
+
+
+def mask_to_characters(mask: int) -> tuple[str, ...]:
+    """Get the characters in a mask, sorted by name to guarantee deterministic random selection."""
+    return tuple(character for character, character_mask in _CHARACTER_MASKS_BY_NAME if mask & character_mask)
+
+
+_CHARACTER_MASKS_BY_NAME: tuple[tuple[str, int], ...] = tuple(sorted(CHARACTER_MASKS.items()))
+
+BASE_GAME_CHARACTERS_MASK = characters_to_mask(BASE_GAME_CHARACTERS.characters)
+ABYSSAL_TERRORS_CHARACTERS_MASK = characters_to_mask(ABYSSAL_TERRORS_CHARACTERS.characters)
+
+_STARTING_CHARACTERS_MASKS: dict[int, int] = {
+    StartingCharacters.option_default_all: characters_to_mask(
+        char for group in CHARACTER_GROUPS.values() for char in group.default_characters
+    ),
+    StartingCharacters.option_random_all: characters_to_mask(ALL_CHARACTERS),
+    StartingCharacters.option_default_base_game: characters_to_mask(BASE_GAME_CHARACTERS.default_characters),
+    StartingCharacters.option_random_base_game: BASE_GAME_CHARACTERS_MASK,
+    StartingCharacters.option_default_abyssal_terrors: characters_to_mask(
+        ABYSSAL_TERRORS_CHARACTERS.default_characters
+    ),
+    StartingCharacters.option_random_abyssal_terrors: ABYSSAL_TERRORS_CHARACTERS_MASK,
+}
+_ABYSSAL_TERRORS_STARTING_CHARACTER_MODES = frozenset(
+    {StartingCharacters.option_default_abyssal_terrors, StartingCharacters.option_random_abyssal_terrors}
+)
 
 
 class CharacterInfoOutput(NamedTuple):
@@ -25,6 +54,16 @@ class CharacterInfoOutput(NamedTuple):
     starting_characters: list[str]
 
 
+class CharacterCandidates(NamedTuple):
+    """The characters which can be picked for a world, before any random selection is done.
+
+    Both are sorted to guarantee deterministic random selection.
+    """
+
+    valid_characters: tuple[str, ...]
+    valid_starting_characters: tuple[str, ...]
+
+
 def get_available_and_starting_characters(
     include_base_game_characters: set[str],
     enable_abyssal_terrors_dlc: bool,
@@ -34,31 +73,39 @@ def get_available_and_starting_characters(
     num_characters: int,
     random: random.Random,
 ) -> CharacterInfoOutput:
-    character_pack_info: dict[str, CharacterGroupInfo] = {
-        BASE_GAME_CHARACTERS.name: CharacterGroupInfo(
-            enabled=True,
-            include_characters=include_base_game_characters,
-            group=BASE_GAME_CHARACTERS,
-        ),
-        ABYSSAL_TERRORS_CHARACTERS.name: CharacterGroupInfo(
-            enabled=enable_abyssal_terrors_dlc,
-            include_characters=include_abyssal_terrors_characters,
-            group=ABYSSAL_TERRORS_CHARACTERS,
-        ),
-    }
-
-    valid_characters: set[str] = set()
-    for pack_enabled, include_characters_from_pack, pack_characters in character_pack_info.values():
-        if pack_enabled:
-            valid_characters |= {c for c in pack_characters.characters if c in include_characters_from_pack}
+    candidates = get_character_candidates(
+        include_base_game_characters,
+        enable_abyssal_terrors_dlc,
+        include_abyssal_terrors_characters,
+        starting_character_mode,
+        num_starting_characters,
+        num_characters,
+    )
+    return select_characters(candidates, num_starting_characters, num_characters, random)
+
+
+def get_character_candidates(
+    include_base_game_characters: Set[str],
+    enable_abyssal_terrors_dlc: bool,
+    include_abyssal_terrors_characters: Set[str],
+    starting_character_mode: StartingCharacters,
+    num_starting_characters: int,
+    num_characters: int,
+) -> CharacterCandidates:
+    """Determine which characters can be included and which can be starting characters from the options.
+
+    This is the deterministic half of get_available_and_starting_characters, so the result can be reused by worlds with
+    the same options. Raises an OptionError if there are no valid starting characters.
+    """
+    valid_characters_mask = BASE_GAME_CHARACTERS_MASK & characters_to_mask(include_base_game_characters)
+    if enable_abyssal_terrors_dlc:
+        include_abyssal_terrors_mask = characters_to_mask(include_abyssal_terrors_characters)
+        valid_characters_mask |= ABYSSAL_TERRORS_CHARACTERS_MASK & include_abyssal_terrors_mask
 
     # Pick characters from the starting character pool first, then add more others until we have the requested amount.
-    all_starting_characters_for_option: list[str] = get_starting_characters_for_option(
-        starting_character_mode, enable_abyssal_terrors_dlc
+    valid_starting_characters = mask_to_characters(
+        get_starting_characters_mask(starting_character_mode, enable_abyssal_terrors_dlc) & valid_characters_mask
     )
-    valid_starting_characters: list[str] = [
-        char for char in all_starting_characters_for_option if char in valid_characters
-    ]
     if not valid_starting_characters:
         options_str = ", ".join(
             [
@@ -73,13 +120,30 @@ def get_available_and_starting_characters(
         )
         raise OptionError(f"No valid starting characters for given options: {options_str}")
 
-    num_starting_characters_to_select = min(num_starting_characters, len(valid_starting_characters), num_characters)
-    starting_characters: list[str] = random.sample(valid_starting_characters, num_starting_characters_to_select)
+    return CharacterCandidates(
+        valid_characters=mask_to_characters(valid_characters_mask), valid_starting_characters=valid_starting_characters
+    )
+
+
+def select_characters(
+    candidates: CharacterCandidates,
+    num_starting_characters: int,
+    num_characters: int,
+    random: random.Random,
+) -> CharacterInfoOutput:
+    """Randomly pick the included and starting characters from the candidates."""
+    num_starting_characters_to_select = min(
+        num_starting_characters, len(candidates.valid_starting_characters), num_characters
+    )
+    starting_characters: list[str] = random.sample(
+        candidates.valid_starting_characters, num_starting_characters_to_select
+    )
 
     included_characters: list[str] = starting_characters.copy()
     num_characters_to_add = num_characters - len(included_characters)
     if num_characters_to_add > 0:
-        valid_characters_to_add = sorted(valid_characters - set(starting_characters))
+        starting_characters_set = set(starting_characters)
+        valid_characters_to_add = [c for c in candidates.valid_characters if c not in starting_characters_set]
         num_characters_to_sample = min(num_characters_to_add, len(valid_characters_to_add))
         included_characters += random.sample(valid_characters_to_add, num_characters_to_sample)
     return CharacterInfoOutput(available_characters=included_characters, starting_characters=starting_characters)
@@ -96,29 +160,14 @@ def get_starting_characters_for_option(
     Returns a sorted list of the valid starting characters. The output is sorted to guarantee deterministic random
     selection.
     """
-    starting_characters: Sequence[str]
-    match starting_character_mode.value:
-        case StartingCharacters.option_default_all:
-            starting_characters = [char for group in CHARACTER_GROUPS.values() for char in group.default_characters]
-        case StartingCharacters.option_random_all:
-            starting_characters = ALL_CHARACTERS
-        case StartingCharacters.option_default_base_game:
-            starting_characters = BASE_GAME_CHARACTERS.default_characters
-        case StartingCharacters.option_random_base_game:
-            starting_characters = BASE_GAME_CHARACTERS.characters
-        case StartingCharacters.option_default_abyssal_terrors:
-            if not enable_abyssal_terrors_dlc:
-                raise OptionError(
-                    f"Starting option set to {starting_character_mode}, but Abyssal Terrors DLC is disabled."
-                )
-            starting_characters = ABYSSAL_TERRORS_CHARACTERS.default_characters
-        case StartingCharacters.option_random_abyssal_terrors:
-            if not enable_abyssal_terrors_dlc:
-                raise OptionError(
-                    f"Starting option set to {starting_character_mode}, but Abyssal Terrors DLC is disabled."
-                )
-            starting_characters = ABYSSAL_TERRORS_CHARACTERS.characters
-        case _:
-            raise OptionError(f"Unknown value for starting character option: {starting_character_mode}")
-
-    return sorted(starting_characters)
+    return list(mask_to_characters(get_starting_characters_mask(starting_character_mode, enable_abyssal_terrors_dlc)))
+
+
+def get_starting_characters_mask(starting_character_mode: StartingCharacters, enable_abyssal_terrors_dlc: bool) -> int:
+    """Like get_starting_characters_for_option, but returns a mask of the characters. See CHARACTER_MASKS."""
+    mask = _STARTING_CHARACTERS_MASKS.get(starting_character_mode.value)
+    if mask is None:
+        raise OptionError(f"Unknown value for starting character option: {starting_character_mode}")
+    if starting_character_mode.value in _ABYSSAL_TERRORS_STARTING_CHARACTER_MODES and not enable_abyssal_terrors_dlc:
+        raise OptionError(f"Starting option set to {starting_character_mode}, but Abyssal Terrors DLC is disabled.")
+    return mask
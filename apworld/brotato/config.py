@@ -0,0 +1,62 @@
+from dataclasses import dataclass, fields
+
+from .options import BrotatoOptions
+
+
+@dataclass(frozen=True)
+class BrotatoConfig:
+    """A frozen, hashable snapshot of the values of BrotatoOptions.
+
+    Created once per world in generate_early. Reading from this is cheaper than `self.options.<x>.value`, and since it's
+    hashable it can be used as a cache key for the parts of generation that only depend on the options (see
+    generation_plan.py).
+
+    The field names match the BrotatoOptions field names, which is how the values are copied over.
+    """
+
+    num_victories: int
+    num_characters: int
+    num_starting_characters: int
+    starting_characters: int
+    include_base_game_characters: frozenset[str]
+    waves_per_drop: int
+    gold_reward_mode: int
+    xp_reward_mode: int
+    enable_enemy_xp: int
+    spawn_normal_loot_crates: int
+    num_common_crate_drops: int
+    num_common_crate_drops_per_check: int
+    num_common_crate_drop_groups: int
+    num_legendary_crate_drops: int
+    num_legendary_crate_drops_per_check: int
+    num_legendary_crate_drop_groups: int
+    local_filler_in_loot_crates: int
+    common_item_weight: int
+    uncommon_item_weight: int
+    rare_item_weight: int
+    legendary_item_weight: int
+    common_upgrade_weight: int
+    uncommon_upgrade_weight: int
+    rare_upgrade_weight: int
+    legendary_upgrade_weight: int
+    gold_weight: int
+    xp_weight: int
+    legacy_item_sampling: int
+    compact_slot_data: int
+    num_starting_shop_slots: int
+    shop_lock_buttons_mode: int
+    num_starting_lock_buttons: int
+    enable_abyssal_terrors_dlc: int
+    include_abyssal_terrors_characters: frozenset[str]
+    death_link: int
+
+    @classmethod
+    def from_options(cls, options: BrotatoOptions) -> "BrotatoConfig":
+        values = {}
+        for field in fields(cls):
+            value = getattr(options, field.name).value
+            # OptionSet values are regular sets, which aren't hashable.
+            if isinstance(value, set):
+                value = frozenset(value)
+            values[field.name] = value
+        return cls(**values)
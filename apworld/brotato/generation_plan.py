@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .characters import CharacterCandidates, get_character_candidates
+from .config import BrotatoConfig
+from .item_weights import create_item_weights
+from .items import ItemName
+from .loot_crates import BrotatoLootCrateGroup, get_loot_crate_groups
+from .options import (
+    NumberStartingShopLockButtons,
+    StartingCharacters,
+    StartingShopLockButtonsMode,
+    StartingShopSlots,
+    WavesPerCheck,
+)
+from .shop_slots import get_num_shop_slot_and_lock_button_items
+from .waves import get_waves_with_checks
+
+GENERATION_PLAN_CACHE_SIZE = 128
+"""The maximum number of generation plans kept in the cache.
+
+Each plan is small, so this is mostly to keep a long-running process (like WebHost) from growing forever.
+"""
+
+
+@dataclass(frozen=True)
+class BrotatoGenerationPlan:
+    """Everything generate_early derives from the options that doesn't need the world's random.
+
+    Plans are cached and shared between every world with the same options, so every field is immutable. Only picking
+    the characters and the item pool, which use the world's random, is still done separately for each world.
+    """
+
+    waves_with_checks: tuple[int, ...]
+    character_candidates: CharacterCandidates
+    num_characters: int
+    """The number of characters that will be included, which doesn't depend on which characters are picked."""
+    num_starting_characters: int
+    num_wins_needed: int
+    common_loot_crate_groups: tuple[BrotatoLootCrateGroup, ...]
+    legendary_loot_crate_groups: tuple[BrotatoLootCrateGroup, ...]
+    num_shop_slot_items: int
+    num_shop_lock_button_items: int
+    num_locations: int
+    """The number of locations available, not including the "Run Won" locations, which always have "Run Won" items."""
+    num_essential_items: int
+    num_nonessential_items: int
+    item_names: tuple[ItemName, ...]
+    """The nonessential items to pick from, in the same order as item_weights."""
+    item_weights: tuple[int, ...]
+
+
+@lru_cache(maxsize=GENERATION_PLAN_CACHE_SIZE)
+def get_generation_plan(config: BrotatoConfig) -> BrotatoGenerationPlan:
+    """Get the generation plan for the given options, creating it if it's not already cached.
+
+    Raises an OptionError if the options can't be used to generate a world. Errors aren't cached, so the error is
+    raised again for every world with the same options.
+    """
+    waves_with_checks = tuple(get_waves_with_checks(WavesPerCheck(config.waves_per_drop)))
+
+    character_candidates = get_character_candidates(
+        config.include_base_game_characters,
+        bool(config.enable_abyssal_terrors_dlc),
+        config.include_abyssal_terrors_characters,
+        StartingCharacters(config.starting_characters),
+        config.num_starting_characters,
+        config.num_characters,
+    )
+    # These are what select_characters will pick, we just don't know which characters they are yet.
+    num_characters = min(config.num_characters, len(character_candidates.valid_characters))
+    num_starting_characters = min(
+        config.num_starting_characters, len(character_candidates.valid_starting_characters), config.num_characters
+    )
+
+    # Clamp the number of wins needed to goal to the number of included characters, so the game isn't unwinnable.
+    num_wins_needed = min(config.num_victories, num_characters)
+
+    # Thought: if num victories is clamped, do some of the groups become unreachable?
+    common_loot_crate_groups = get_loot_crate_groups(
+        config.num_common_crate_drops, config.num_common_crate_drop_groups, num_wins_needed
+    )
+    legendary_loot_crate_groups = get_loot_crate_groups(
+        config.num_legendary_crate_drops, config.num_legendary_crate_drop_groups, num_wins_needed
+    )
+
+    num_shop_slot_items, num_shop_lock_button_items = get_num_shop_slot_and_lock_button_items(
+        StartingShopSlots(config.num_starting_shop_slots),
+        StartingShopLockButtonsMode(config.shop_lock_buttons_mode),
+        NumberStartingShopLockButtons(config.num_starting_lock_buttons),
+    )
+
+    num_locations = sum(
+        [
+            num_characters,  # Run Won Locations
+            num_characters * len(waves_with_checks),  # Wave Complete Locations
+            config.num_common_crate_drops,
+            config.num_legendary_crate_drops,
+        ]
+    )
+
+    num_essential_items = sum(
+        [
+            num_characters,  # Run Won Items
+            num_characters - num_starting_characters,  # The character items
+            num_shop_slot_items,
+            num_shop_lock_button_items,
+        ]
+    )
+
+    item_weights = create_item_weights(
+        config.common_item_weight,
+        config.uncommon_item_weight,
+        config.rare_item_weight,
+        config.legendary_item_weight,
+        config.common_upgrade_weight,
+        config.uncommon_upgrade_weight,
+        config.rare_upgrade_weight,
+        config.legendary_upgrade_weight,
+        config.gold_weight,
+        config.xp_weight,
+    )
+
+    return BrotatoGenerationPlan(
+        waves_with_checks=waves_with_checks,
+        character_candidates=character_candidates,
+        num_characters=num_characters,
+        num_starting_characters=num_starting_characters,
+        num_wins_needed=num_wins_needed,
+        common_loot_crate_groups=common_loot_crate_groups,
+        legendary_loot_crate_groups=legendary_loot_crate_groups,
+        num_shop_slot_items=num_shop_slot_items,
+        num_shop_lock_button_items=num_shop_lock_button_items,
+        num_locations=num_locations,
+        num_essential_items=num_essential_items,
+        num_nonessential_items=max(num_locations - num_essential_items, 0),
+        item_names=tuple(item_weights.keys()),
+        item_weights=tuple(item_weights.values()),
+    )
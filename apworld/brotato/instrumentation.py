@@ -0,0 +1,153 @@
+"""Diagnostics for Brotato generation, for finding out what large rooms spend their time and memory on.
+
+Every stage wrapped with instrument_stage() logs a DEBUG record to the "Brotato" logger with how long the stage took and
+how many regions, locations, items, etc. it created. The values are also attached to the record as a JSON-serializable
+dict in its "brotato_stage" attribute, so log handlers can aggregate them without parsing the message. This costs a
+couple of timer reads per stage, and nothing else if DEBUG logging is off, so it's always enabled.
+
+Memory tracing is opt-in. Set the BROTATO_TRACE_MEMORY environment variable to a non-empty value other than "0" to log,
+after each stage, how many bytes and objects were allocated during the stage and are still alive, attributed to the
+line in this package which allocated them (directly, or by calling into Archipelago). Allocations which don't pass
+through this package at all are ignored. The report goes to the "Brotato" logger at INFO level.
+
+This uses tracemalloc, which makes generation several times slower and uses a lot of memory itself, so only enable it
+to investigate.
+"""
+
+import logging
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+logger = logging.getLogger("Brotato")
+
+STAGE_RECORD_ATTRIBUTE = "brotato_stage"
+"""The attribute of the log records from instrument_stage() with the stage's values."""
+
+TRACE_MEMORY_ENV_VAR = "BROTATO_TRACE_MEMORY"
+
+TRACEMALLOC_NUM_FRAMES = 32
+"""How many frames tracemalloc keeps for each allocation.
+
+Enough to find the line in this package which led to an allocation inside Archipelago, like a Region's lists.
+"""
+
+MEMORY_REPORT_NUM_LINES = 20
+"""How many of the lines which allocated the most memory to include in each report."""
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class MemoryUsage(NamedTuple):
+    size: int
+    """Bytes allocated and still alive."""
+    count: int
+    """Number of memory blocks, i.e. roughly the number of objects, allocated and still alive."""
+
+
+class StageMemoryReport(NamedTuple):
+    stage: str
+    total: MemoryUsage
+    by_line: dict[tuple[str, int], MemoryUsage]
+    """The memory allocated from each line in this package, by file name (relative to the package) and line number."""
+
+    def by_file(self) -> dict[str, MemoryUsage]:
+        sizes: defaultdict[str, int] = defaultdict(int)
+        counts: defaultdict[str, int] = defaultdict(int)
+        for (filename, _), usage in self.by_line.items():
+            sizes[filename] += usage.size
+            counts[filename] += usage.count
+        return {filename: MemoryUsage(sizes[filename], counts[filename]) for filename in sizes}
+
+    def format(self, num_lines: int = MEMORY_REPORT_NUM_LINES) -> str:
+        lines = [f"Memory allocated by Brotato in {self.stage}: {_format_usage(self.total)}", "  By file:"]
+        for filename, usage in sorted(self.by_file().items(), key=lambda f: f[1].size, reverse=True):
+            lines.append(f"    {filename}: {_format_usage(usage)}")
+        lines.append(f"  Top {num_lines} lines:")
+        top_lines = sorted(self.by_line.items(), key=lambda line: line[1].size, reverse=True)[:num_lines]
+        for (filename, lineno), usage in top_lines:
+            lines.append(f"    {filename}:{lineno}: {_format_usage(usage)}")
+        return "\n".join(lines)
+
+
+def _format_usage(usage: MemoryUsage) -> str:
+    return f"{usage.size / 1024:+,.1f} KiB in {usage.count:+,} blocks"
+
+
+def trace_memory_enabled() -> bool:
+    return os.environ.get(TRACE_MEMORY_ENV_VAR, "") not in ("", "0")
+
+
+def _package_frame(traceback: tracemalloc.Traceback) -> tuple[str, int] | None:
+    """The most recent frame of the traceback which is in this package, as a relative file name and line number."""
+    # Tracebacks are ordered from the oldest frame to the most recent.
+    for frame in reversed(traceback):
+        if frame.filename.startswith(_PACKAGE_DIR):
+            return os.path.relpath(frame.filename, _PACKAGE_DIR), frame.lineno
+    return None
+
+
+def compare_snapshots(stage: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> StageMemoryReport:
+    """Attribute the memory allocated between the snapshots to the lines in this package which allocated it."""
+    package_filter = [tracemalloc.Filter(True, os.path.join(_PACKAGE_DIR, "*"), all_frames=True)]
+    sizes: defaultdict[tuple[str, int], int] = defaultdict(int)
+    counts: defaultdict[tuple[str, int], int] = defaultdict(int)
+    for stat in after.filter_traces(package_filter).compare_to(before.filter_traces(package_filter), "traceback"):
+        frame = _package_frame(stat.traceback)
+        if frame is None or (stat.size_diff == 0 and stat.count_diff == 0):
+            continue
+        sizes[frame] += stat.size_diff
+        counts[frame] += stat.count_diff
+
+    by_line = {frame: MemoryUsage(sizes[frame], counts[frame]) for frame in sizes}
+    total = MemoryUsage(sum(sizes.values()), sum(counts.values()))
+    return StageMemoryReport(stage, total, by_line)
+
+
+@contextmanager
+def trace_stage_memory(stage: str) -> Iterator[None]:
+    """Log the memory allocated by this package during the block, if enabled. See the module docstring.
+
+    Tracing is started the first time this is used and left running, so later stages can be compared to earlier ones.
+    """
+    if not trace_memory_enabled():
+        yield
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_NUM_FRAMES)
+    before = tracemalloc.take_snapshot()
+    yield
+    report = compare_snapshots(stage, before, tracemalloc.take_snapshot())
+    logger.info(report.format())
+
+
+@contextmanager
+def instrument_stage(stage: str, seed_name: str | None = None, player: int | None = None) -> Iterator[dict[str, int]]:
+    """Time the block and log it, along with its memory usage if enabled. See the module docstring.
+
+    The block can add counts, like the number of regions it created, to the yielded dict to include them in the record.
+    Pass the player for stages which run for each world separately. Nothing is logged if the block raises.
+    """
+    label = stage if player is None else f"{stage} (player {player})"
+    counts: dict[str, int] = {}
+    with trace_stage_memory(label):
+        start = time.perf_counter_ns()
+        yield counts
+        duration_ns = time.perf_counter_ns() - start
+
+    if logger.isEnabledFor(logging.DEBUG):
+        values: dict[str, Any] = {
+            "stage": stage,
+            "seed_name": seed_name,
+            "player": player,
+            "duration_ms": duration_ns / 1_000_000,
+            **counts,
+        }
+        logger.debug(
+            "%s took %.2f ms: %s", label, values["duration_ms"], counts, extra={STAGE_RECORD_ATTRIBUTE: values}
+        )
@@ -1,6 +1,7 @@
 import itertools
 import math
 from collections import Counter
+from collections.abc import Sequence
 from random import Random
 
 from Options import OptionError
@@ -22,28 +23,168 @@ def create_items_from_weights(
     legendary_upgrade_weight: options.LegendaryUpgradeWeight,
     gold_weight: options.GoldWeight,
     xp_weight: options.XpWeight,
+    legacy_sampling: bool = False,
 ) -> dict[ItemName, int]:
+    item_name_to_weight = create_item_weights(
+        common_item_weight.value,
+        uncommon_item_weight.value,
+        rare_item_weight.value,
+        legendary_item_weight.value,
+        common_upgrade_weight.value,
+        uncommon_upgrade_weight.value,
+        rare_upgrade_weight.value,
+        legendary_upgrade_weight.value,
+        gold_weight.value,
+        xp_weight.value,
+    )
+    return sample_items_from_weights(
+        num_items,
+        random,
+        tuple(item_name_to_weight.keys()),
+        tuple(item_name_to_weight.values()),
+        legacy_sampling=legacy_sampling,
+    )
+
+
+def create_item_weights(
+    common_item_weight: int,
+    uncommon_item_weight: int,
+    rare_item_weight: int,
+    legendary_item_weight: int,
+    common_upgrade_weight: int,
+    uncommon_upgrade_weight: int,
+    rare_upgrade_weight: int,
+    legendary_upgrade_weight: int,
+    gold_weight: int,
+    xp_weight: int,
+) -> dict[ItemName, int]:
+    """Get the weight of each item from the weight option values.
+
+    The gold and XP weights are split between each of the gold and XP items, respectively.
+    """
     gold_items = [ItemName(g) for g in sorted(item_name_groups["Gold"])]
     xp_items = [ItemName(x) for x in sorted(item_name_groups["XP"])]
-    gold_item_weights = _create_weights_for_item_group(gold_weight.value, gold_items)
-    xp_item_weights = _create_weights_for_item_group(xp_weight.value, xp_items)
-    item_name_to_weight: dict[ItemName, int] = {
-        ItemName.COMMON_ITEM: common_item_weight.value,
-        ItemName.UNCOMMON_ITEM: uncommon_item_weight.value,
-        ItemName.RARE_ITEM: rare_item_weight.value,
-        ItemName.LEGENDARY_ITEM: legendary_item_weight.value,
-        ItemName.COMMON_UPGRADE: common_upgrade_weight.value,
-        ItemName.UNCOMMON_UPGRADE: uncommon_upgrade_weight.value,
-        ItemName.RARE_UPGRADE: rare_upgrade_weight.value,
-        ItemName.LEGENDARY_UPGRADE: legendary_upgrade_weight.value,
+    gold_item_weights = _create_weights_for_item_group(gold_weight, gold_items)
+    xp_item_weights = _create_weights_for_item_group(xp_weight, xp_items)
+    return {
+        ItemName.COMMON_ITEM: common_item_weight,
+        ItemName.UNCOMMON_ITEM: uncommon_item_weight,
+        ItemName.RARE_ITEM: rare_item_weight,
+        ItemName.LEGENDARY_ITEM: legendary_item_weight,
+        ItemName.COMMON_UPGRADE: common_upgrade_weight,
+        ItemName.UNCOMMON_UPGRADE: uncommon_upgrade_weight,
+        ItemName.RARE_UPGRADE: rare_upgrade_weight,
+        ItemName.LEGENDARY_UPGRADE: legendary_upgrade_weight,
         **gold_item_weights,
         **xp_item_weights,
     }
 
+
+def sample_items_from_weights(
+    num_items: int,
+    random: Random,
+    item_names: Sequence[ItemName],
+    item_weights: Sequence[int],
+    legacy_sampling: bool = False,
+) -> dict[ItemName, int]:
+    """Randomly choose num_items items using the given weights, and return how many of each item was chosen.
+
+    Only items which were chosen at least once are included. The counts are drawn directly from the multinomial
+    distribution, which is the same distribution as choosing each item one at a time, but only needs one random draw
+    per item name instead of one per item.
+
+    Set legacy_sampling to choose each item one at a time like earlier versions did instead, which is needed to
+    reproduce the items of a seed generated by those versions. See the LegacyItemSampling option.
+    """
+    if legacy_sampling:
+        return _sample_items_with_choices(num_items, random, item_names, item_weights)
+
+    remaining_weight = sum(item_weights)
+    if remaining_weight <= 0:
+        raise OptionError("At least one item weight must be >0")
+
+    # Draw each count from a binomial distribution: each of the remaining items has a weight / remaining_weight chance
+    # of being this item, given it wasn't any of the items before it.
+    item_counts: dict[ItemName, int] = {}
+    remaining_items = num_items
+    for item_name, weight in zip(item_names, item_weights, strict=True):
+        if remaining_items <= 0:
+            break
+        if weight <= 0:
+            continue
+        if weight >= remaining_weight:
+            count = remaining_items
+        else:
+            count = _binomial_variate(random, remaining_items, weight / remaining_weight)
+        if count > 0:
+            item_counts[item_name] = count
+        remaining_items -= count
+        remaining_weight -= weight
+    return item_counts
+
+
+def _binomial_variate(random: Random, n: int, p: float) -> int:
+    """Draw the number of successes in n trials which each succeed with probability p, where 0 < p < 1.
+
+    This is the algorithm Random.binomialvariate uses in Python 3.12 and 3.13, and gives the same results for the same
+    random state. It's copied instead of called so the same seed creates the same items on every Python version, even
+    if later versions change Random.binomialvariate, or on versions before 3.12 which don't have it.
+    """
+    if n == 1:
+        return int(random.random() < p)
+
+    # Only count the less likely outcome, so p <= 0.5.
+    if p > 0.5:
+        return n - _binomial_variate(random, n, 1.0 - p)
+
+    if n * p < 10.0:
+        # Devroye's geometric method, which takes O(np) time: skip ahead to each success.
+        successes = trials = 0
+        c = math.log2(1.0 - p)
+        if not c:
+            return successes
+        while True:
+            trials += math.floor(math.log2(random.random()) / c) + 1
+            if trials > n:
+                return successes
+            successes += 1
+
+    # Hormann's transformed rejection with squeeze (BTRS), which takes O(1) expected time.
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    # Only needed if the squeeze test below fails, so only calculated then.
+    alpha = lpq = h = 0.0
+    m = -1
+
+    while True:
+        u = random.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+
+        v = random.random()
+        if us >= 0.07 and v <= vr:
+            return k
+
+        if m < 0:
+            alpha = (2.83 + 5.1 / b) * spq
+            lpq = math.log(p / (1.0 - p))
+            m = math.floor((n + 1) * p)
+            h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+        v *= alpha / (a / (us * us) + b)
+        if math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+
+def _sample_items_with_choices(
+    num_items: int, random: Random, item_names: Sequence[ItemName], item_weights: Sequence[int]
+) -> dict[ItemName, int]:
     try:
-        chosen_items = random.choices(
-            list(item_name_to_weight.keys()), weights=list(item_name_to_weight.values()), k=num_items
-        )
+        chosen_items = random.choices(item_names, weights=item_weights, k=num_items)
     except ValueError as ve:
         # The Python docs state that random.choices raises a ValueError if all weights are zero.
         raise OptionError("At least one item weight must be >0") from ve
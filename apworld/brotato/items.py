@@ -1,15 +1,16 @@
-from dataclasses import dataclass, field
+from collections.abc import Callable
+from dataclasses import dataclass
 from enum import Enum
-from itertools import count
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from BaseClasses import Item, ItemClassification
 
 from .constants import BASE_ID
 
-_id_generator = count(BASE_ID, step=1)
-
 
 class BrotatoItem(Item):
+    # Item uses __slots__, so declaring none here keeps instances from having a __dict__. game is a class constant.
+    __slots__ = ()
     game: str = "Brotato"
 
 
@@ -19,11 +20,24 @@ class BrotatoItemBase:
 
     name: "ItemName"
     classification: ItemClassification
-    # Auto-increments ID without us having to manually set it, so item definition order matters.
-    code: int = field(default_factory=_id_generator.__next__)
+    code: int
 
     def to_item(self, player: int) -> BrotatoItem:
-        return BrotatoItem(self.name.value, self.classification, self.code, player)
+        return BrotatoItem(*self.to_prototype(), player)
+
+    def to_prototype(self) -> "ItemPrototype":
+        return ItemPrototype(self.name.value, self.classification, self.code)
+
+
+class ItemPrototype(NamedTuple):
+    """The arguments to create a BrotatoItem with, minus the player.
+
+    Creating items from these skips the name and ID lookups, which adds up when creating hundreds of items per player.
+    """
+
+    name: str
+    classification: ItemClassification
+    code: int
 
 
 class ItemName(Enum):
@@ -119,38 +133,39 @@ class ItemName(Enum):
 
 _char_items: list[ItemName] = [x for x in ItemName if x.name.startswith("CHARACTER_")]
 
-_items: list[BrotatoItemBase] = [
-    BrotatoItemBase(name=ItemName.COMMON_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.UNCOMMON_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.RARE_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.LEGENDARY_ITEM, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.COMMON_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.UNCOMMON_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.RARE_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.LEGENDARY_UPGRADE, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.SHOP_SLOT, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.SHOP_LOCK_BUTTON, classification=ItemClassification.useful),
-    BrotatoItemBase(name=ItemName.XP_5, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_10, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_25, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_50, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_100, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.XP_150, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_10, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_25, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_50, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_100, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.GOLD_200, classification=ItemClassification.filler),
-    BrotatoItemBase(name=ItemName.RUN_COMPLETE, classification=ItemClassification.progression),
+# The classification of every item. Item IDs are assigned in the order of this dict starting at BASE_ID, so the order
+# matters and new items must be added at the end.
+_item_classifications: dict[ItemName, ItemClassification] = {
+    ItemName.COMMON_ITEM: ItemClassification.useful,
+    ItemName.UNCOMMON_ITEM: ItemClassification.useful,
+    ItemName.RARE_ITEM: ItemClassification.useful,
+    ItemName.LEGENDARY_ITEM: ItemClassification.useful,
+    ItemName.COMMON_UPGRADE: ItemClassification.useful,
+    ItemName.UNCOMMON_UPGRADE: ItemClassification.useful,
+    ItemName.RARE_UPGRADE: ItemClassification.useful,
+    ItemName.LEGENDARY_UPGRADE: ItemClassification.useful,
+    ItemName.SHOP_SLOT: ItemClassification.useful,
+    ItemName.SHOP_LOCK_BUTTON: ItemClassification.useful,
+    ItemName.XP_5: ItemClassification.filler,
+    ItemName.XP_10: ItemClassification.filler,
+    ItemName.XP_25: ItemClassification.filler,
+    ItemName.XP_50: ItemClassification.filler,
+    ItemName.XP_100: ItemClassification.filler,
+    ItemName.XP_150: ItemClassification.filler,
+    ItemName.GOLD_10: ItemClassification.filler,
+    ItemName.GOLD_25: ItemClassification.filler,
+    ItemName.GOLD_50: ItemClassification.filler,
+    ItemName.GOLD_100: ItemClassification.filler,
+    ItemName.GOLD_200: ItemClassification.filler,
+    ItemName.RUN_COMPLETE: ItemClassification.progression,
     # Individual items for each character
-    *[BrotatoItemBase(name=c, classification=ItemClassification.progression) for c in _char_items],
-]
+    **dict.fromkeys(_char_items, ItemClassification.progression),
+}
 
-item_table: dict[int, BrotatoItemBase] = {item.code: item for item in _items}
-item_name_to_id: dict[str, int] = {item.name.value: item.code for item in _items}
+item_name_to_id: dict[str, int] = {name.value: BASE_ID + idx for idx, name in enumerate(_item_classifications)}
 
 filler_items: list[str] = [
-    item.name.value for item in item_table.values() if item.classification == ItemClassification.filler
+    name.value for name, classification in _item_classifications.items() if classification == ItemClassification.filler
 ]
 
 item_name_groups: dict[str, set[str]] = {
@@ -184,3 +199,43 @@ item_name_groups: dict[str, set[str]] = {
     },
     "Characters": {c.value for c in _char_items},
 }
+
+
+# The rest of the tables are only needed when generating, so they're built the first time they're accessed (see
+# __getattr__ below) instead of on import.
+if TYPE_CHECKING:
+    item_table: dict[int, BrotatoItemBase]
+    item_prototypes: dict[str | ItemName, ItemPrototype]
+    """The prototype for each item, keyed by both the ItemName and the item name string."""
+
+
+def _create_item_table() -> dict[int, BrotatoItemBase]:
+    return {
+        item_name_to_id[name.value]: BrotatoItemBase(name, classification, item_name_to_id[name.value])
+        for name, classification in _item_classifications.items()
+    }
+
+
+def _create_item_prototypes() -> dict[str | ItemName, ItemPrototype]:
+    item_prototypes: dict[str | ItemName, ItemPrototype] = {}
+    for name, classification in _item_classifications.items():
+        item_prototypes[name] = item_prototypes[name.value] = ItemPrototype(
+            name.value, classification, item_name_to_id[name.value]
+        )
+    return item_prototypes
+
+
+_lazy_table_factories: dict[str, Callable[[], Any]] = {
+    "item_table": _create_item_table,
+    "item_prototypes": _create_item_prototypes,
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        factory = _lazy_table_factories[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # Store the table as a regular module attribute so this is only called once per table.
+    table = globals()[name] = factory()
+    return table
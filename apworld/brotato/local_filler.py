@@ -0,0 +1,32 @@
+"""Placing a world's filler items in its own loot crate locations before the main fill. See LocalFillerInLootCrates.
+
+The items are chosen in create_items, but stay in the item pool until pre_fill, so anything which changes the pool in
+between, like item links, sees them. No more are chosen than there are crate locations which can hold them, but plando
+also runs in between and can fill some of them first. The items which don't fit are then left in the pool.
+"""
+
+from collections.abc import Iterable, Sequence
+from random import Random
+
+from BaseClasses import Item, Location
+
+
+def get_num_local_filler(num_filler_items: int, percent: int, num_crate_locations: int) -> int:
+    """The number of filler items to place in the crate locations.
+
+    Never more than there are crate locations, since there would be nowhere to put the rest. Only count the crate
+    locations the items can go in, i.e. not priority locations.
+    """
+    return min(num_filler_items * percent // 100, num_crate_locations)
+
+
+def place_local_filler(items: Sequence[Item], locations: Iterable[Location], random: Random) -> list[Item]:
+    """Place the items in random empty locations, and return the items which didn't fit.
+
+    Locations which already have an item, e.g. from plando, are skipped.
+    """
+    empty_locations = [location for location in locations if location.item is None]
+    random.shuffle(empty_locations)
+    for location, item in zip(empty_locations, items, strict=False):
+        location.place_locked_item(item)
+    return list(items[len(empty_locations) :])
@@ -1,7 +1,8 @@
-from collections.abc import Iterable
-from dataclasses import dataclass, field
-from itertools import count
-from typing import get_args
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Any, get_args
 
 from BaseClasses import Location, LocationProgressType, Region
 
@@ -20,7 +21,6 @@ from .constants import (
 
 # TypeVar that's a union of all character name string literals
 CHARACTER_NAMES: tuple[str, ...] = get_args(ALL_CHARACTERS)
-_id_generator = count(BASE_ID, step=1)
 
 
 class BrotatoLocation(Location):
@@ -39,78 +39,145 @@ class BrotatoLegendaryCrateLocation(Location):
 class BrotatoLocationBase:
     name: str
     is_event: bool = False
-    id: int = field(init=False)
+    id: int | None = None
     progress_type: LocationProgressType = LocationProgressType.DEFAULT
 
-    def __post_init__(self):
-        if not self.is_event:
-            id_ = BASE_ID + next(_id_generator)
-        else:
-            id_ = None
-        # Necessary to set field on frozen dataclass
-        object.__setattr__(self, "id", id_)
-
     def to_location(self, player: int, parent: Region | None = None) -> BrotatoLocation:
         location = BrotatoLocation(player, name=self.name, address=self.id, parent=parent)
-        location.progress_type = self.progress_type
+        # Only store the progress type on the instance if it's not the class default.
+        if self.progress_type != BrotatoLocation.progress_type:
+            location.progress_type = self.progress_type
         return location
 
 
+# All locations are stored in one compact table, ordered by ID, which is the order the IDs were originally assigned in:
+#
+#   * For each character, in ALL_CHARACTERS order, a "Wave Complete" location for each wave then a "Run Won" location.
+#   * The common loot crate locations.
+#   * The legendary loot crate locations.
+#
+# The ID of each location is then just _FIRST_LOCATION_ID plus its position (ordinal) in the table. Everything else,
+# including the dicts AP needs, is derived from this table. The location IDs must not change, since they're used by
+# existing multiworlds.
+_FIRST_LOCATION_ID = BASE_ID + BASE_ID  # IDs were historically offset by BASE_ID twice, keep it that way.
+_LOCATIONS_PER_CHARACTER = NUM_WAVES + 1
+_FIRST_COMMON_CRATE_ORDINAL = len(ALL_CHARACTERS) * _LOCATIONS_PER_CHARACTER
+_FIRST_LEGENDARY_CRATE_ORDINAL = _FIRST_COMMON_CRATE_ORDINAL + MAX_NORMAL_CRATE_DROPS
+_NUM_LOCATIONS = _FIRST_LEGENDARY_CRATE_ORDINAL + MAX_LEGENDARY_CRATE_DROPS
+
 _wave_count = range(1, NUM_WAVES + 1)
+_character_ordinals: dict[str, int] = {char: idx for idx, char in enumerate(ALL_CHARACTERS)}
 
 
-def _get_per_location_characters_for_characters(
-    characters: Iterable[str],
-) -> tuple[list[BrotatoLocationBase], list[BrotatoLocationBase]]:
-    wave_complete_locations: list[BrotatoLocationBase] = []
-    run_complete_locations: list[BrotatoLocationBase] = []
-    for character in characters:
-        wave_complete_locations += [
-            BrotatoLocationBase(name=WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=character))
-            for w in _wave_count
-        ]
-        run_complete_locations.append(BrotatoLocationBase(name=RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character)))
+def _get_character_location_names(char: str) -> list[str]:
+    return [
+        *[WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=w, char=char) for w in _wave_count],
+        RUN_COMPLETE_LOCATION_TEMPLATE.format(char=char),
+    ]
 
-    return wave_complete_locations, run_complete_locations
 
+# Interned so every player's locations share the same name objects.
+_location_names: tuple[str, ...] = tuple(
+    sys.intern(name)
+    for name in [
+        *chain.from_iterable(_get_character_location_names(char) for char in ALL_CHARACTERS),
+        *[CRATE_DROP_LOCATION_TEMPLATE.format(num=i) for i in range(1, MAX_NORMAL_CRATE_DROPS + 1)],
+        *[LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i) for i in range(1, MAX_LEGENDARY_CRATE_DROPS + 1)],
+    ]
+)
 
-# Get the per-character locations (wave/run complete), separated by the game pack the characters come from.
-_character_wave_complete_locations: dict[str, list[BrotatoLocationBase]] = {}
-_character_run_won_locations: dict[str, list[BrotatoLocationBase]] = {}
-for group_name, group in CHARACTER_GROUPS.items():
-    _character_wave_complete_locations[group_name], _character_run_won_locations[group_name] = (
-        _get_per_location_characters_for_characters(group.characters)
-    )
 
-_loot_crate_drop_locations: list[BrotatoLocationBase] = [
-    BrotatoLocationBase(name=CRATE_DROP_LOCATION_TEMPLATE.format(num=i)) for i in range(1, MAX_NORMAL_CRATE_DROPS + 1)
-]
-_legendary_loot_crate_drop_locations: list[BrotatoLocationBase] = [
-    BrotatoLocationBase(
-        name=LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE.format(num=i),
-    )
-    for i in range(1, MAX_LEGENDARY_CRATE_DROPS + 1)
-]
+def _wave_complete_ordinal(character_ordinal: int, wave: int) -> int:
+    return character_ordinal * _LOCATIONS_PER_CHARACTER + wave - 1
+
 
-_all_locations: list[BrotatoLocationBase] = [
-    *[loc for group_locs in _character_wave_complete_locations.values() for loc in group_locs],
-    *[loc for group_locs in _character_run_won_locations.values() for loc in group_locs],
-    *_loot_crate_drop_locations,
-    *_legendary_loot_crate_drop_locations,
-]
+def _run_won_ordinal(character_ordinal: int) -> int:
+    return character_ordinal * _LOCATIONS_PER_CHARACTER + NUM_WAVES
 
-location_table: dict[str, BrotatoLocationBase] = {loc.name: loc for loc in _all_locations}
 
-location_name_to_id: dict[str, int] = {loc.name: loc.id for loc in _all_locations}
+# AP reads these when BrotatoWorld is defined, so they can't be built lazily. Keep the original insertion order of all
+# "Wave Complete" locations, then all "Run Won" locations, then the loot crates.
+location_name_to_id: dict[str, int] = {
+    _location_names[ordinal]: _FIRST_LOCATION_ID + ordinal
+    for ordinal in chain(
+        (_wave_complete_ordinal(c, w) for c in range(len(ALL_CHARACTERS)) for w in _wave_count),
+        (_run_won_ordinal(c) for c in range(len(ALL_CHARACTERS))),
+        range(_FIRST_COMMON_CRATE_ORDINAL, _NUM_LOCATIONS),
+    )
+}
 location_name_groups: dict[str, set[str]] = {
-    "Normal Crate Drops": {c.name for c in _loot_crate_drop_locations},
-    "Legendary Crate Drops": {c.name for c in _legendary_loot_crate_drop_locations},
+    "Normal Crate Drops": set(_location_names[_FIRST_COMMON_CRATE_ORDINAL:_FIRST_LEGENDARY_CRATE_ORDINAL]),
+    "Legendary Crate Drops": set(_location_names[_FIRST_LEGENDARY_CRATE_ORDINAL:]),
 }
 
-for group_name, group in CHARACTER_GROUPS.items():
+for group in CHARACTER_GROUPS.values():
+    _group_character_ordinals = [_character_ordinals[char] for char in group.characters]
     location_name_groups[f"Wave Complete ({group.name} Characters)"] = {
-        c.name for c in _character_wave_complete_locations[group_name]
+        _location_names[_wave_complete_ordinal(c, w)] for c in _group_character_ordinals for w in _wave_count
     }
     location_name_groups[f"Run Won ({group.name} Characters)"] = {
-        c.name for c in _character_run_won_locations[group_name]
+        _location_names[_run_won_ordinal(c)] for c in _group_character_ordinals
+    }
+
+
+# The rest of the tables are only needed when generating, so they're built from the compact table the first time
+# they're accessed (see __getattr__ below) instead of on import.
+LocationNameAndId = tuple[str, int]
+
+if TYPE_CHECKING:
+    location_table: dict[str, BrotatoLocationBase]
+    wave_complete_locations_by_character: dict[str, tuple[LocationNameAndId, ...]]
+    """The "Wave Complete" locations for each character. Index 0 is wave 1."""
+    run_won_location_by_character: dict[str, LocationNameAndId]
+    common_crate_locations: tuple[LocationNameAndId, ...]
+    """The common loot crate locations. Index 0 is "Loot Crate 1"."""
+    legendary_crate_locations: tuple[LocationNameAndId, ...]
+    """The legendary loot crate locations. Index 0 is "Legendary Loot Crate 1"."""
+
+
+def _get_name_and_id(ordinal: int) -> LocationNameAndId:
+    return _location_names[ordinal], _FIRST_LOCATION_ID + ordinal
+
+
+def _create_location_table() -> dict[str, BrotatoLocationBase]:
+    return {name: BrotatoLocationBase(name=name, id=id_) for name, id_ in location_name_to_id.items()}
+
+
+def _create_wave_complete_locations_by_character() -> dict[str, tuple[LocationNameAndId, ...]]:
+    return {
+        char: tuple(_get_name_and_id(_wave_complete_ordinal(char_ordinal, w)) for w in _wave_count)
+        for char, char_ordinal in _character_ordinals.items()
+    }
+
+
+def _create_run_won_location_by_character() -> dict[str, LocationNameAndId]:
+    return {
+        char: _get_name_and_id(_run_won_ordinal(char_ordinal)) for char, char_ordinal in _character_ordinals.items()
     }
+
+
+def _create_common_crate_locations() -> tuple[LocationNameAndId, ...]:
+    return tuple(_get_name_and_id(o) for o in range(_FIRST_COMMON_CRATE_ORDINAL, _FIRST_LEGENDARY_CRATE_ORDINAL))
+
+
+def _create_legendary_crate_locations() -> tuple[LocationNameAndId, ...]:
+    return tuple(_get_name_and_id(o) for o in range(_FIRST_LEGENDARY_CRATE_ORDINAL, _NUM_LOCATIONS))
+
+
+_lazy_table_factories: dict[str, Callable[[], Any]] = {
+    "location_table": _create_location_table,
+    "wave_complete_locations_by_character": _create_wave_complete_locations_by_character,
+    "run_won_location_by_character": _create_run_won_location_by_character,
+    "common_crate_locations": _create_common_crate_locations,
+    "legendary_crate_locations": _create_legendary_crate_locations,
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        factory = _lazy_table_factories[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # Store the table as a regular module attribute so this is only called once per table.
+    table = globals()[name] = factory()
+    return table
@@ -0,0 +1,62 @@
+from BaseClasses import CollectionState, MultiWorld
+from worlds.AutoWorld import LogicMixin
+
+from .constants import ALL_CHARACTERS
+from .items import ItemName
+
+RUN_WON_ITEM_NAME = ItemName.RUN_COMPLETE.value
+
+CHARACTER_MASKS: dict[str, int] = {char: 1 << idx for idx, char in enumerate(ALL_CHARACTERS)}
+"""The bit for each character in BrotatoLogic.brotato_characters."""
+
+
+class BrotatoLogic(LogicMixin):
+    """Brotato-specific state tracked on every CollectionState.
+
+    The access rules only ever check the number of runs won and which characters are unlocked. Tracking these as plain
+    integers, updated by BrotatoWorld.collect() and BrotatoWorld.remove(), lets each rule be a single integer
+    comparison instead of an item count lookup. The rules are evaluated thousands of times per sweep.
+
+    This module must be imported with the world (not lazily), so the mixin is registered before any state is created.
+    """
+
+    brotato_run_wins: dict[int, int]
+    """The number of "Run Won" items collected by each Brotato player."""
+    brotato_characters: dict[int, int]
+    """A bitmask of the character items collected by each Brotato player. See CHARACTER_MASKS."""
+
+    def init_mixin(self, multiworld: MultiWorld) -> None:
+        # Item link groups are worlds of the same game and collect items too, so include them.
+        players = [*multiworld.get_game_players("Brotato"), *multiworld.get_game_groups("Brotato")]
+        self.brotato_run_wins = dict.fromkeys(players, 0)
+        self.brotato_characters = dict.fromkeys(players, 0)
+
+    def copy_mixin(self, new_state: CollectionState) -> CollectionState:
+        new_state.brotato_run_wins = self.brotato_run_wins.copy()
+        new_state.brotato_characters = self.brotato_characters.copy()
+        return new_state
+
+
+def update_logic_on_collect(state: CollectionState, player: int, item_name: str, count: int = 1) -> None:
+    """Update the values BrotatoLogic tracks after count copies of the item were collected.
+
+    See BrotatoWorld.collect().
+    """
+    if item_name == RUN_WON_ITEM_NAME:
+        state.brotato_run_wins[player] += count
+    else:
+        character_mask = CHARACTER_MASKS.get(item_name)
+        if character_mask is not None:
+            state.brotato_characters[player] |= character_mask
+
+
+def update_logic_on_remove(state: CollectionState, player: int, item_name: str, count: int = 1) -> None:
+    """Update the values BrotatoLogic tracks after count copies of the item were removed.
+
+    The item counts in state.prog_items must already be updated. See BrotatoWorld.remove().
+    """
+    if item_name == RUN_WON_ITEM_NAME:
+        state.brotato_run_wins[player] -= count
+    elif item_name in CHARACTER_MASKS and state.prog_items[player][item_name] < 1:
+        # Only lock the character once every copy of its item has been removed.
+        state.brotato_characters[player] &= ~CHARACTER_MASKS[item_name]
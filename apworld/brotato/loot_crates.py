@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -55,3 +56,32 @@ def build_loot_crate_groups(num_crates: int, num_groups: int, num_victories: int
             wins_to_unlock_group = min(wins_to_unlock_group + num_wins_to_unlock_group, num_victories)
 
     return loot_crate_groups
+
+
+# Only a few layouts are used in a multiworld, but don't keep everything from something like an exhaustive test.
+@lru_cache(maxsize=256)
+def get_loot_crate_groups(num_crates: int, num_groups: int, num_victories: int) -> tuple[BrotatoLootCrateGroup, ...]:
+    """Get the same groups as build_loot_crate_groups, as a tuple shared by every caller with the same arguments.
+
+    Each argument is bounded by an option's range, so there are a limited number of layouts and each is only created
+    once per multiworld. The groups are frozen, so sharing them is safe.
+
+    Instead of building the groups one by one, each group's values are calculated directly:
+
+    * The crates are split as evenly as possible, with the first (num_crates % num_groups) groups getting one extra.
+    * Groups with no crates are skipped, which can only be the groups after those with an extra crate, so the created
+      groups always start from group 1.
+    * Each group needs (num_victories // num_groups), but at least 1, more wins than the previous, up to num_victories.
+    """
+    num_groups_actual = min(num_groups, num_victories)
+    crates_per_group, extra_crates = divmod(num_crates, num_groups_actual)
+    num_wins_to_unlock_group = max(num_victories // num_groups_actual, 1)
+    num_nonempty_groups = num_groups_actual if crates_per_group > 0 else extra_crates
+    return tuple(
+        BrotatoLootCrateGroup(
+            index=index,
+            num_crates=crates_per_group + (index <= extra_crates),
+            wins_to_unlock=min((index - 1) * num_wins_to_unlock_group, num_victories),
+        )
+        for index in range(1, num_nonempty_groups + 1)
+    )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from Options import Choice, DeathLinkMixin, OptionSet, PerGameCommonOptions, Range, Toggle
+from Options import Choice, DeathLinkMixin, OptionSet, PerGameCommonOptions, Range, Toggle, Visibility
 
 from .constants import (
     ABYSSAL_TERRORS_CHARACTERS,
@@ -254,6 +254,24 @@ class NumberLegendaryCrateDropGroups(Range):
     display_name: str = "Legendary Loot Crate Groups"
 
 
+class LocalFillerInLootCrates(Range):
+    """The percentage of your gold and XP items to place in your own loot crate locations, before the rest of the
+    multiworld is filled.
+
+    Gold and XP never unlock anything, so this doesn't change what anyone needs to finish their game. It does mean fewer
+    of your loot crate locations will have items for other players, and makes large multiworlds faster to generate.
+
+    Loot crate locations in "Priority Locations" and items in "Non-Local Items" are left for the regular fill, as are
+    any items which don't fit in your loot crate locations.
+    """
+
+    range_start = 0
+    range_end = 100
+
+    default = 0
+    display_name = "Local Filler in Loot Crates"
+
+
 # Item weights
 #
 # The default values of each weight are meant to give a distribution of items matching:
@@ -406,6 +424,28 @@ class XpWeight(Range):
     display_name = "XP Weight"
 
 
+class LegacyItemSampling(Toggle):
+    """Choose the items from the weights above one at a time, like versions 0.15.0 and earlier did.
+
+    Only needed to reproduce the items of a seed generated with one of those versions. The items are chosen with the
+    same odds either way.
+    """
+
+    display_name = "Legacy Item Sampling"
+    visibility = Visibility.none
+
+
+class CompactSlotData(Toggle):
+    """Send the waves items are given on as the number of items of each rarity, instead of the wave for every item.
+
+    This makes the slot data much smaller with lots of locations, but client mods from version 0.15.0 and earlier can't
+    read it. Only enable this if every client connecting to the slot is newer.
+    """
+
+    display_name = "Compact Slot Data"
+    visibility = Visibility.none
+
+
 class StartingShopSlots(Range):
     """How many slot the shop begins with. Missing slots are added as items."""
 
@@ -494,6 +534,7 @@ class BrotatoOptions(PerGameCommonOptions, DeathLinkMixin):
     num_legendary_crate_drops: NumberLegendaryCrateDropLocations
     num_legendary_crate_drops_per_check: NumberLegendaryCrateDropsPerCheck
     num_legendary_crate_drop_groups: NumberLegendaryCrateDropGroups
+    local_filler_in_loot_crates: LocalFillerInLootCrates
     common_item_weight: CommonItemWeight
     uncommon_item_weight: UncommonItemWeight
     rare_item_weight: RareItemWeight
@@ -504,6 +545,8 @@ class BrotatoOptions(PerGameCommonOptions, DeathLinkMixin):
     legendary_upgrade_weight: LegendaryUpgradeWeight
     gold_weight: GoldWeight
     xp_weight: XpWeight
+    legacy_item_sampling: LegacyItemSampling
+    compact_slot_data: CompactSlotData
     num_starting_shop_slots: StartingShopSlots
     shop_lock_buttons_mode: StartingShopLockButtonsMode
     num_starting_lock_buttons: NumberStartingShopLockButtons
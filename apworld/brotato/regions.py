@@ -1,40 +1,75 @@
-from collections.abc import Callable
-from typing import Literal
+import sys
+from collections.abc import Callable, Sequence
+from typing import Literal, NamedTuple
 
-from BaseClasses import Region
+from BaseClasses import Location, Region
 
 from .constants import (
+    ALL_CHARACTERS,
     CHARACTER_REGION_TEMPLATE,
     CRATE_DROP_GROUP_REGION_TEMPLATE,
-    CRATE_DROP_LOCATION_TEMPLATE,
     LEGENDARY_CRATE_DROP_GROUP_REGION_TEMPLATE,
-    LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE,
+    MAX_LEGENDARY_CRATE_DROP_GROUPS,
+    MAX_NORMAL_CRATE_DROP_GROUPS,
     NUM_WAVES,
-    RUN_COMPLETE_LOCATION_TEMPLATE,
-    WAVE_COMPLETE_LOCATION_TEMPLATE,
 )
-from .locations import BrotatoCommonCrateLocation, BrotatoLegendaryCrateLocation, BrotatoLocation, location_table
-from .loot_crates import BrotatoLootCrateGroup
-from .rules import (
-    create_has_character_rule,
-    create_has_run_wins_rule,
+from .locations import (
+    BrotatoCommonCrateLocation,
+    BrotatoLegendaryCrateLocation,
+    BrotatoLocation,
+    common_crate_locations,
+    legendary_crate_locations,
+    run_won_location_by_character,
+    wave_complete_locations_by_character,
 )
+from .loot_crates import BrotatoLootCrateGroup
+from .shared_data import BrotatoSharedData
 
 RegionFactory = Callable[[str], Region]
 
+# Like the location names, format the region names once here instead of for every player.
+_character_region_names: dict[str, str] = {
+    char: sys.intern(CHARACTER_REGION_TEMPLATE.format(char=char)) for char in ALL_CHARACTERS
+}
+# Loot crate groups are numbered from 1, so index 0 is unused.
+_common_crate_group_region_names: tuple[str, ...] = tuple(
+    sys.intern(CRATE_DROP_GROUP_REGION_TEMPLATE.format(num=i)) for i in range(MAX_NORMAL_CRATE_DROP_GROUPS + 1)
+)
+_legendary_crate_group_region_names: tuple[str, ...] = tuple(
+    sys.intern(LEGENDARY_CRATE_DROP_GROUP_REGION_TEMPLATE.format(num=i))
+    for i in range(MAX_LEGENDARY_CRATE_DROP_GROUPS + 1)
+)
+
+
+class BrotatoRegions(NamedTuple):
+    regions: list[Region]
+    run_won_locations: list[Location]
+    """The "Run Won" location of each character, in the same order as the characters passed to create_regions.
+
+    Returned so the "Run Won" items can be placed without looking up the locations by name.
+    """
+
 
 def create_regions(
     region_factory: RegionFactory,
-    characters: list[str],
-    waves_with_checks: list[int],
-    common_loot_crate_groups: list[BrotatoLootCrateGroup],
-    legendary_loot_crate_groups: list[BrotatoLootCrateGroup],
-) -> list[Region]:
+    characters: Sequence[str],
+    waves_with_checks: Sequence[int],
+    common_loot_crate_groups: Sequence[BrotatoLootCrateGroup],
+    legendary_loot_crate_groups: Sequence[BrotatoLootCrateGroup],
+    shared_data: BrotatoSharedData | None = None,
+) -> BrotatoRegions:
+    """Create all the regions for a player.
+
+    Pass shared_data when creating regions for multiple players, so the rules are reused.
+    """
+    if shared_data is None:
+        shared_data = BrotatoSharedData()
+
     menu_region: Region = region_factory("Menu")
 
     regions: list[Region] = [menu_region]
 
-    crate_type_and_groups: list[tuple[Literal["common", "legendary"], list[BrotatoLootCrateGroup]]] = [
+    crate_type_and_groups: list[tuple[Literal["common", "legendary"], Sequence[BrotatoLootCrateGroup]]] = [
         ("common", common_loot_crate_groups),
         ("legendary", legendary_loot_crate_groups),
     ]
@@ -45,33 +80,48 @@ def create_regions(
                 region_factory, group, loot_crate_type, crate_count_start=crate_count
             )
             crate_count += group.num_crates
-            has_wins_rule = create_has_run_wins_rule(loot_crate_group_region.player, group.wins_to_unlock)
+            has_wins_rule = shared_data.rules.has_run_wins(loot_crate_group_region.player, group.wins_to_unlock)
             menu_region.connect(loot_crate_group_region, name=loot_crate_group_region.name, rule=has_wins_rule)
             regions.append(loot_crate_group_region)
 
+    run_won_locations: list[Location] = []
     for char in characters:
         character_region = create_character_region(region_factory, char, waves_with_checks)
-        has_character_rule = create_has_character_rule(character_region.player, char)
+        has_character_rule = shared_data.rules.has_character(character_region.player, char)
         menu_region.connect(character_region, f"Start Game ({char})", rule=has_character_rule)
         regions.append(character_region)
+        run_won_locations.append(character_region.locations[0])
 
-    return regions
-
+    return BrotatoRegions(regions, run_won_locations)
 
-def create_character_region(create_region: RegionFactory, character: str, waves_with_checks: list[int]) -> Region:
-    character_region: Region = create_region(CHARACTER_REGION_TEMPLATE.format(char=character))
-    run_complete_location_name = RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character)
-    region_locations: dict[str, int | None] = {
-        run_complete_location_name: location_table[run_complete_location_name].id
-    }
 
+def create_character_region(
+    create_region: RegionFactory,
+    character: str,
+    waves_with_checks: Sequence[int],
+) -> Region:
+    """Create the region for a character.
+
+    The "Run Won" location is always the first location in the region, followed by the "Wave Complete" locations.
+    """
+    wave_complete_locations = wave_complete_locations_by_character[character]
+    run_won_location_name, run_won_location_id = run_won_location_by_character[character]
+    character_region: Region = create_region(_character_region_names[character])
+    player = character_region.player
+
+    # Create the locations directly instead of using Region.add_locations, which needs a dict of names to IDs.
+    region_locations: list[Location] = [
+        BrotatoLocation(player, run_won_location_name, run_won_location_id, character_region)
+    ]
     for wave in waves_with_checks:
         if wave not in range(1, NUM_WAVES + 1):
             raise ValueError(f"Invalid wave number {wave}.")
-        wave_complete_location_name = WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=wave, char=character)
-        region_locations[wave_complete_location_name] = location_table[wave_complete_location_name].id
+        wave_complete_location_name, wave_complete_location_id = wave_complete_locations[wave - 1]
+        region_locations.append(
+            BrotatoLocation(player, wave_complete_location_name, wave_complete_location_id, character_region)
+        )
 
-    character_region.add_locations(region_locations, BrotatoLocation)
+    character_region.locations += region_locations
     return character_region
 
 
@@ -82,26 +132,30 @@ def create_loot_crate_group_region(
     crate_count_start: int = 1,
 ) -> Region:
     if crate_type == "common":
-        location_name_template = CRATE_DROP_LOCATION_TEMPLATE
-        region_name_template = CRATE_DROP_GROUP_REGION_TEMPLATE
+        crate_locations = common_crate_locations
+        region_name = _common_crate_group_region_names[loot_crate_group.index]
         location_cls = BrotatoCommonCrateLocation
     else:
-        location_name_template = LEGENDARY_CRATE_DROP_LOCATION_TEMPLATE
-        region_name_template = LEGENDARY_CRATE_DROP_GROUP_REGION_TEMPLATE
+        crate_locations = legendary_crate_locations
+        region_name = _legendary_crate_group_region_names[loot_crate_group.index]
         location_cls = BrotatoLegendaryCrateLocation
 
-    group_region: Region = create_region(region_name_template.format(num=loot_crate_group.index))
-    group_locations: dict[str, int | None] = {}
-    for crate_index in range(crate_count_start, crate_count_start + loot_crate_group.num_crates):
-        crate_location_name = location_name_template.format(num=crate_index)
-        group_locations[crate_location_name] = location_table[crate_location_name].id
+    group_region: Region = create_region(region_name)
+    player = group_region.player
+    # The crate numbers start at 1, the indices at 0.
+    group_locations: list[Location] = [
+        location_cls(player, location_name, location_id, group_region)
+        for location_name, location_id in crate_locations[
+            crate_count_start - 1 : crate_count_start - 1 + loot_crate_group.num_crates
+        ]
+    ]
 
     if not group_locations:
         raise ValueError(
             f"No loot crate locations created for {loot_crate_group=}, {crate_type=}, {crate_count_start=}."
         )
 
-    group_region.add_locations(group_locations, location_cls)
+    group_region.locations += group_locations
     # group_region_rule = create_has_run_wins_rule(group_region.player, group.wins_to_unlock)
     # parent_region.connect(group_region, name=group_region.name, rule=group_region_rule)
     # regions.append(group_region)
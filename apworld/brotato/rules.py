@@ -1,18 +1,71 @@
 from BaseClasses import CollectionState
 from worlds.generic.Rules import CollectionRule
 
-from .items import ItemName
+from .logic import CHARACTER_MASKS, RUN_WON_ITEM_NAME
+
+
+def create_has_rule(player: int, item: str, count: int = 1) -> CollectionRule:
+    """Create a rule for having at least `count` of an item.
+
+    This reads the state's item counts directly instead of calling state.has(), which saves a method call every time
+    the rule is evaluated. The rules are evaluated thousands of times during fill and the playthrough.
+    """
+
+    def has_item(state: CollectionState) -> bool:
+        return state.prog_items[player][item] >= count
+
+    return has_item
 
 
 def create_has_run_wins_rule(player: int, count: int) -> CollectionRule:
+    """Create a rule for having won at least `count` runs, using the tally kept by BrotatoLogic."""
+
     def has_wins(state: CollectionState) -> bool:
-        return state.has(ItemName.RUN_COMPLETE.value, player, count)
+        return state.brotato_run_wins[player] >= count
 
     return has_wins
 
 
 def create_has_character_rule(player: int, character: str) -> CollectionRule:
-    def char_region_access_rule(state: CollectionState):
-        return state.has(character, player)
+    """Create a rule for having a character unlocked, using the bitmask kept by BrotatoLogic."""
+    character_mask = CHARACTER_MASKS[character]
+
+    def has_character(state: CollectionState) -> bool:
+        return (state.brotato_characters[player] & character_mask) != 0
+
+    return has_character
+
+
+class BrotatoRuleFactory:
+    """Creates access rules, reusing the same rule object for every request with the same player, item and count.
+
+    Rules which are always true aren't created at all. None is returned instead, which Region.connect() treats as
+    having no rule, so AP doesn't need to call anything to check the entrance.
+    """
+
+    def __init__(self) -> None:
+        self._has_rules: dict[tuple[int, str, int], CollectionRule] = {}
+
+    def has(self, player: int, item: str, count: int = 1) -> CollectionRule | None:
+        if count <= 0:
+            return None
+        key = (player, item, count)
+        rule = self._has_rules.get(key)
+        if rule is None:
+            rule = self._has_rules[key] = self._create_rule(player, item, count)
+        return rule
+
+    @staticmethod
+    def _create_rule(player: int, item: str, count: int) -> CollectionRule:
+        # Use the values tracked by BrotatoLogic where possible, they're cheaper to check than the item counts.
+        if item == RUN_WON_ITEM_NAME:
+            return create_has_run_wins_rule(player, count)
+        if item in CHARACTER_MASKS and count == 1:
+            return create_has_character_rule(player, item)
+        return create_has_rule(player, item, count)
+
+    def has_run_wins(self, player: int, count: int) -> CollectionRule | None:
+        return self.has(player, RUN_WON_ITEM_NAME, count)
 
-    return char_region_access_rule
+    def has_character(self, player: int, character: str) -> CollectionRule | None:
+        return self.has(player, character)
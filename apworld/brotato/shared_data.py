@@ -0,0 +1,15 @@
+from .rules import BrotatoRuleFactory
+
+
+class BrotatoSharedData:
+    """Data shared by every Brotato world in a multiworld.
+
+    This is created once per multiworld by BrotatoWorld.stage_generate_early(), so each world's stages only need to
+    create the objects that belong to it instead of rebuilding the same objects for every region.
+    """
+
+    rules: BrotatoRuleFactory
+    """Creates the access rules, reusing rules with the same player, item and count."""
+
+    def __init__(self) -> None:
+        self.rules = BrotatoRuleFactory()
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Any
+
+from .loot_crates import BrotatoLootCrateGroup
+
+SLOT_DATA_VERSION = 1
+"""The version of the slot_data layout. Increment this when removing or changing the meaning of a key."""
+
+
+def _loot_crate_group_to_dict(group: BrotatoLootCrateGroup) -> dict[str, int]:
+    # Equivalent to dataclasses.asdict(), without the recursion and deep copies.
+    return {"index": group.index, "num_crates": group.num_crates, "wins_to_unlock": group.wins_to_unlock}
+
+
+@dataclass(frozen=True)
+class BrotatoSlotData:
+    """The slot_data sent to the client mod, which reads each key by name.
+
+    The field names are the slot_data keys, so renaming a field breaks the client. Created by
+    BrotatoWorld.fill_slot_data(), then converted to the dict Archipelago expects with to_dict().
+    """
+
+    deathlink: int
+    waves_with_checks: tuple[int, ...]
+    num_wins_needed: int
+    gold_reward_mode: int
+    xp_reward_mode: int
+    enable_enemy_xp: bool
+    num_starting_shop_slots: int
+    num_starting_shop_lock_buttons: int
+    spawn_normal_loot_crates: bool
+    num_common_crate_locations: int
+    num_common_crate_drops_per_check: int
+    common_crate_drop_groups: tuple[BrotatoLootCrateGroup, ...]
+    num_legendary_crate_locations: int
+    num_legendary_crate_drops_per_check: int
+    legendary_crate_drop_groups: tuple[BrotatoLootCrateGroup, ...]
+    wave_per_game_item: dict[int, list[int]] | None
+    """The wave each item is given on, for each rarity. Sent unless compact_slot_data is on. See
+    waves.get_wave_for_each_item."""
+    wave_per_game_item_compact: dict[str, Any] | None
+    """The same as wave_per_game_item, as the number of items of each rarity. Only sent if compact_slot_data is on,
+    since released clients only read wave_per_game_item. See waves.encode_wave_per_game_item."""
+    enable_abyssal_terrors_dlc: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the dict returned by fill_slot_data, plus the slot_data version.
+
+        This is written out instead of using dataclasses.asdict(), which deep copies every value, including each loot
+        crate group.
+        """
+        slot_data: dict[str, Any] = {
+            "slot_data_version": SLOT_DATA_VERSION,
+            "deathlink": self.deathlink,
+            "waves_with_checks": self.waves_with_checks,
+            "num_wins_needed": self.num_wins_needed,
+            "gold_reward_mode": self.gold_reward_mode,
+            "xp_reward_mode": self.xp_reward_mode,
+            "enable_enemy_xp": self.enable_enemy_xp,
+            "num_starting_shop_slots": self.num_starting_shop_slots,
+            "num_starting_shop_lock_buttons": self.num_starting_shop_lock_buttons,
+            "spawn_normal_loot_crates": self.spawn_normal_loot_crates,
+            "num_common_crate_locations": self.num_common_crate_locations,
+            "num_common_crate_drops_per_check": self.num_common_crate_drops_per_check,
+            "common_crate_drop_groups": [_loot_crate_group_to_dict(g) for g in self.common_crate_drop_groups],
+            "num_legendary_crate_locations": self.num_legendary_crate_locations,
+            "num_legendary_crate_drops_per_check": self.num_legendary_crate_drops_per_check,
+            "legendary_crate_drop_groups": [_loot_crate_group_to_dict(g) for g in self.legendary_crate_drop_groups],
+            "enable_abyssal_terrors_dlc": self.enable_abyssal_terrors_dlc,
+        }
+        if self.wave_per_game_item is not None:
+            slot_data["wave_per_game_item"] = self.wave_per_game_item
+        if self.wave_per_game_item_compact is not None:
+            slot_data["wave_per_game_item_compact"] = self.wave_per_game_item_compact
+        return slot_data
@@ -1,16 +1,42 @@
+from collections.abc import Hashable, Mapping
 from contextlib import contextmanager
 from typing import Any, ClassVar
 
+from BaseClasses import CollectionState, MultiWorld
 from test.bases import WorldTestBase
 
 from .. import BrotatoWorld
 from .data_sets.base import BrotatoTestDataSet
 
+_world_cache: dict[Hashable, MultiWorld] = {}
+"""Multiworlds generated by BrotatoTestBase.world_setup, by their options. Shared by every test in the session.
+
+Each test process has its own cache, so this is safe to use when running tests in parallel with pytest-xdist.
+"""
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert an option value to something hashable, so the options can be used as a cache key."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set | frozenset):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
 
 class BrotatoTestBase(WorldTestBase):
     game = "Brotato"
     world: BrotatoWorld  # type: ignore
     player: ClassVar[int] = 1
+    cache_worlds: ClassVar[bool] = True
+    """Reuse the multiworld generated by an earlier test with the same options, instead of generating it again.
+
+    Every test gets a fresh CollectionState, but otherwise the multiworld is shared, so tests shouldn't change anything
+    but the state. Set this to False for tests which do. The default WorldTestBase tests, like test_fill, never use the
+    cache.
+    """
 
     @contextmanager
     def data_set_subtest(self, data_set: BrotatoTestDataSet, **kwargs):
@@ -32,3 +58,25 @@ class BrotatoTestBase(WorldTestBase):
         finally:
             # self.tearDown()
             self.options = original_options
+
+    def world_setup(self, seed: int | None = None) -> None:
+        # The default tests fill the multiworld, and a specific seed means the test wants its own multiworld.
+        if not self.cache_worlds or seed is not None or hasattr(WorldTestBase, self._testMethodName):
+            super().world_setup(seed)
+            return
+
+        # Tests which stop generating early, or run other steps, can't share a multiworld with those which don't.
+        cache_key = (self.game, self.player, tuple(self.gen_steps), _freeze(self.options))
+        multiworld = _world_cache.get(cache_key)
+        if multiworld is None:
+            # WorldTestBase.world_setup skips generating for some tests, so check that it actually created a multiworld.
+            vars(self).pop("multiworld", None)
+            super().world_setup(seed)
+            if "multiworld" not in vars(self):
+                return
+            multiworld = _world_cache[cache_key] = self.multiworld
+        else:
+            self.multiworld = multiworld
+            self.world = multiworld.worlds[self.player]  # type: ignore
+        # Tests collect and remove items, so don't let them see what earlier tests did.
+        multiworld.state = CollectionState(multiworld)
@@ -0,0 +1,74 @@
+"""Stand-ins for the parts of Archipelago the region and rule code uses, for testing them without generating a world.
+
+create_regions only needs a factory which creates regions, and the rules from rules.py only read the item counts and
+the values BrotatoLogic tracks from the state. These provide just that, so the region graph and its access rules can be
+checked directly for many option combinations, without WorldTestBase generating a whole world for each.
+"""
+
+from collections import Counter, deque
+from collections.abc import Iterable
+
+from BaseClasses import MultiWorld, Region
+
+from ..logic import update_logic_on_collect, update_logic_on_remove
+
+
+class StubRegionFactory:
+    """A region factory for create_regions, which creates regions for one player without generating a world.
+
+    Regions register their locations and exits in the multiworld's region caches when they're created, so they still
+    need a MultiWorld. An empty one is cheap, since no worlds are created in it and it's never filled.
+    """
+
+    def __init__(self, player: int = 1) -> None:
+        self.player = player
+        self.multiworld = MultiWorld(player)
+        self.regions: dict[str, Region] = {}
+        """Every region created, by name."""
+
+    def __call__(self, name: str) -> Region:
+        region = Region(name, self.player, self.multiworld)
+        self.regions[name] = region
+        return region
+
+
+class FakeCollectionState:
+    """Only the item counts of a CollectionState, plus the values BrotatoLogic tracks, for evaluating access rules.
+
+    collect() and remove() update the BrotatoLogic values with the same functions as BrotatoWorld's collect() and
+    remove().
+    """
+
+    def __init__(self, player: int = 1) -> None:
+        self.player = player
+        self.prog_items: dict[int, Counter[str]] = {player: Counter()}
+        self.brotato_run_wins: dict[int, int] = {player: 0}
+        self.brotato_characters: dict[int, int] = {player: 0}
+
+    def collect(self, item_name: str, count: int = 1) -> None:
+        self.prog_items[self.player][item_name] += count
+        update_logic_on_collect(self, self.player, item_name, count)  # type: ignore
+
+    def collect_all(self, item_names: Iterable[str]) -> None:
+        for item_name in item_names:
+            self.collect(item_name)
+
+    def remove(self, item_name: str, count: int = 1) -> None:
+        counts = self.prog_items[self.player]
+        count = min(count, counts[item_name])
+        counts[item_name] -= count
+        update_logic_on_remove(self, self.player, item_name, count)  # type: ignore
+
+
+def reachable_regions(start: Region, state: FakeCollectionState) -> set[str]:
+    """The names of the regions which can be reached from start with the given state."""
+    reached: set[str] = {start.name}
+    to_visit: deque[Region] = deque([start])
+    while to_visit:
+        region = to_visit.popleft()
+        for entrance in region.exits:
+            target = entrance.connected_region
+            if target is not None and target.name not in reached and entrance.access_rule(state):  # type: ignore
+                reached.add(target.name)
+                to_visit.append(target)
+    return reached
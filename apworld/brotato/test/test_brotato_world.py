@@ -1,3 +1,9 @@
+from unittest import TestCase
+
+from test.general import setup_multiworld
+
+from .. import BrotatoWorld
+from ..items import ItemName
 from ..loot_crates import BrotatoLootCrateGroup
 from . import BrotatoTestBase
 from .data_sets.loot_crates import LOOT_CRATE_GROUP_DATA_SETS
@@ -34,3 +40,54 @@ class TestBrotatoWorld(BrotatoTestBase):
                 self.assertEqual(len(groups), len(expected_groups))
                 for group_idx, (group, expected_group) in enumerate(zip(groups, expected_groups, strict=True)):
                     self.assertEqual(group, expected_group, f"Legendary loot crate group {group_idx} is not correct.")
+
+
+class TestBrotatoWorldCache(BrotatoTestBase):
+    """Test that BrotatoTestBase reuses multiworlds with the same options, but not their state."""
+
+    run_default_tests = False  # type:ignore
+
+    def test_same_options_reuse_multiworld_with_fresh_state(self):
+        with self._run({"num_characters": 7}):
+            multiworld = self.multiworld
+            self.collect(self.world.create_item(ItemName.RUN_COMPLETE))
+            self.assertEqual(self.count(ItemName.RUN_COMPLETE.value), 1)
+
+        with self._run({"num_characters": 7}):
+            self.assertIs(self.multiworld, multiworld)
+            self.assertEqual(self.count(ItemName.RUN_COMPLETE.value), 0)
+
+    def test_different_options_do_not_reuse_multiworld(self):
+        with self._run({"num_characters": 7}):
+            multiworld = self.multiworld
+        with self._run({"num_characters": 8}):
+            self.assertIsNot(self.multiworld, multiworld)
+
+    def test_different_gen_steps_do_not_reuse_multiworld(self):
+        with self._run({"num_characters": 7}):
+            multiworld = self.multiworld
+        self.gen_steps = self.gen_steps[:-1]  # type: ignore
+        with self._run({"num_characters": 7}):
+            self.assertIsNot(self.multiworld, multiworld)
+
+
+class TestMultipleBrotatoWorlds(TestCase):
+    """Test that the stage_* methods handle every Brotato world in the multiworld."""
+
+    num_players = 3
+
+    def setUp(self):
+        self.multiworld = setup_multiworld([BrotatoWorld] * self.num_players)
+        self.worlds: tuple[BrotatoWorld, ...] = self.multiworld.get_game_worlds(BrotatoWorld.game)  # type: ignore
+
+    def test_shared_data_is_shared(self):
+        self.assertEqual(len(self.worlds), self.num_players)
+        for world in self.worlds[1:]:
+            self.assertIs(world.shared_data, self.worlds[0].shared_data)
+
+    def test_all_worlds_have_items_for_each_location(self):
+        for world in self.worlds:
+            with self.subTest(player=world.player):
+                num_items = len([item for item in self.multiworld.itempool if item.player == world.player])
+                num_unfilled_locations = len(self.multiworld.get_unfilled_locations(world.player))
+                self.assertEqual(num_items, num_unfilled_locations)
@@ -1,8 +1,13 @@
 import random
 from contextlib import AbstractContextManager, nullcontext
 
-from ..characters import get_available_and_starting_characters
-from ..constants import BASE_GAME_CHARACTERS
+from ..characters import (
+    characters_to_mask,
+    get_available_and_starting_characters,
+    get_starting_characters_for_option,
+    mask_to_characters,
+)
+from ..constants import ABYSSAL_TERRORS_CHARACTERS, ALL_CHARACTERS, BASE_GAME_CHARACTERS
 from ..options import StartingCharacters
 from . import BrotatoTestBase
 from .data_sets.characters import (
@@ -86,3 +91,24 @@ class TestBrotatoCharacterOptions(BrotatoTestBase):
                     )
                     assert starting_characters == repeat_starting_characters
                     assert available_characters == repeat_available_characters
+
+    def test_mask_to_characters_is_sorted(self):
+        self.assertEqual(mask_to_characters(characters_to_mask(ALL_CHARACTERS)), tuple(sorted(ALL_CHARACTERS)))
+        self.assertEqual(mask_to_characters(0), ())
+        self.assertEqual(characters_to_mask(["Not a character"]), 0)
+
+    def test_get_starting_characters_for_option_sorted(self):
+        # The expected lists are how the characters were picked before they were stored as masks.
+        default_all = [*BASE_GAME_CHARACTERS.default_characters, *ABYSSAL_TERRORS_CHARACTERS.default_characters]
+        expected_characters_for_option: dict[int, list[str]] = {
+            StartingCharacters.option_default_all: sorted(default_all),
+            StartingCharacters.option_random_all: sorted(ALL_CHARACTERS),
+            StartingCharacters.option_default_base_game: sorted(BASE_GAME_CHARACTERS.default_characters),
+            StartingCharacters.option_random_base_game: sorted(BASE_GAME_CHARACTERS.characters),
+            StartingCharacters.option_default_abyssal_terrors: sorted(ABYSSAL_TERRORS_CHARACTERS.default_characters),
+            StartingCharacters.option_random_abyssal_terrors: sorted(ABYSSAL_TERRORS_CHARACTERS.characters),
+        }
+        for option_value, expected_characters in expected_characters_for_option.items():
+            with self.subTest(option_value=option_value):
+                characters = get_starting_characters_for_option(StartingCharacters(option_value), True)
+                self.assertListEqual(characters, expected_characters)
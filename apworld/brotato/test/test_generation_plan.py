@@ -0,0 +1,33 @@
+from ..config import BrotatoConfig
+from ..generation_plan import get_generation_plan
+from . import BrotatoTestBase
+from .data_sets.loot_crates import LOOT_CRATE_GROUP_DATA_SETS
+from .data_sets.shop_slots import SHOP_SLOT_TEST_DATA_SETS
+
+
+class TestBrotatoGenerationPlan(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+
+    def test_config_matches_options(self):
+        config = BrotatoConfig.from_options(self.world.options)
+        self.assertEqual(config, self.world.config)
+        self.assertEqual(hash(config), hash(self.world.config))
+        self.assertEqual(config.num_victories, self.world.options.num_victories.value)
+        self.assertEqual(
+            config.include_base_game_characters, frozenset(self.world.options.include_base_game_characters.value)
+        )
+
+    def test_plan_is_shared_between_identical_configs(self):
+        config = BrotatoConfig.from_options(self.world.options)
+        self.assertIs(get_generation_plan(config), get_generation_plan(self.world.config))
+
+    def test_plan_matches_world(self):
+        for test_data in [*LOOT_CRATE_GROUP_DATA_SETS, *SHOP_SLOT_TEST_DATA_SETS]:
+            with self.data_set_subtest(test_data):
+                plan = get_generation_plan(self.world.config)
+                self.assertEqual(plan.num_characters, len(self.world._include_characters))
+                self.assertEqual(plan.num_starting_characters, len(self.world._starting_characters))
+                self.assertEqual(plan.num_wins_needed, self.world.num_wins_needed)
+                self.assertEqual(plan.common_loot_crate_groups, self.world.common_loot_crate_groups)
+                self.assertEqual(plan.legendary_loot_crate_groups, self.world.legendary_loot_crate_groups)
+                self.assertEqual(sum(self.world.nonessential_item_counts.values()), plan.num_nonessential_items)
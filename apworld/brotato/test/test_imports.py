@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from .. import BrotatoWorld
+
+# Modules only needed when generating, which shouldn't be imported just by importing the world.
+GENERATION_ONLY_MODULES: tuple[str, ...] = (
+    "characters",
+    "config",
+    "generation_plan",
+    "instrumentation",
+    "item_weights",
+    "local_filler",
+    "loot_crates",
+    "regions",
+    "rules",
+    "shared_data",
+    "shop_slots",
+    "slot_data",
+    "waves",
+)
+
+
+class TestImports(TestCase):
+    def test_importing_world_does_not_import_generation_modules(self):
+        package = BrotatoWorld.__module__
+        # Use a new interpreter, since the tests themselves import everything.
+        code = f"import sys, worlds, {package}; print(*[m for m in sys.modules if m.startswith('{package}.')])"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        imported_modules = set(result.stdout.split())
+        for module in GENERATION_ONLY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(f"{package}.{module}", imported_modules)
@@ -0,0 +1,93 @@
+import json
+import os
+import tracemalloc
+from unittest import TestCase, mock
+
+from ..instrumentation import STAGE_RECORD_ATTRIBUTE, TRACE_MEMORY_ENV_VAR, instrument_stage, trace_stage_memory
+from . import BrotatoTestBase
+
+THIS_FILE = os.path.join("test", os.path.basename(__file__))
+
+
+def _allocate() -> list[bytearray]:
+    return [bytearray(1024) for _ in range(100)]
+
+
+class TestTraceStageMemory(TestCase):
+    def setUp(self):
+        self._was_tracing = tracemalloc.is_tracing()
+
+    def tearDown(self):
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {TRACE_MEMORY_ENV_VAR: "0"}), self.assertNoLogs("Brotato"):
+            with trace_stage_memory("test_stage"):
+                _allocate()
+        self.assertEqual(tracemalloc.is_tracing(), self._was_tracing)
+
+    def test_reports_allocations_by_file_and_line(self):
+        with (
+            mock.patch.dict(os.environ, {TRACE_MEMORY_ENV_VAR: "1"}),
+            self.assertLogs("Brotato", "INFO") as logs,
+        ):
+            with trace_stage_memory("test_stage"):
+                allocated = _allocate()
+
+        self.assertEqual(len(logs.records), 1)
+        report = logs.records[0].getMessage()
+        self.assertIn("test_stage", report)
+        # The bytearrays are allocated on the line in _allocate, which is the most recent frame in the package.
+        allocate_line = _allocate.__code__.co_firstlineno + 1
+        self.assertIn(f"{THIS_FILE}:{allocate_line}: +", report)
+        self.assertEqual(len(allocated), 100)
+
+
+class TestInstrumentStage(TestCase):
+    def test_logs_record_with_counts(self):
+        with self.assertLogs("Brotato", "DEBUG") as logs:
+            with instrument_stage("test_stage", "seed", 2) as counts:
+                counts["things"] = 3
+
+        self.assertEqual(len(logs.records), 1)
+        values = getattr(logs.records[0], STAGE_RECORD_ATTRIBUTE)
+        self.assertEqual(values["stage"], "test_stage")
+        self.assertEqual(values["seed_name"], "seed")
+        self.assertEqual(values["player"], 2)
+        self.assertEqual(values["things"], 3)
+        self.assertGreaterEqual(values["duration_ms"], 0)
+        # The whole point is for log handlers to be able to serialize it.
+        self.assertEqual(json.loads(json.dumps(values)), values)
+
+    def test_no_record_if_stage_raises(self):
+        with self.assertNoLogs("Brotato", "DEBUG"), self.assertRaises(ValueError):
+            with instrument_stage("test_stage"):
+                raise ValueError
+
+
+class TestBrotatoWorldStageRecords(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+    cache_worlds = False
+
+    def test_stages_log_records(self):
+        # Generate again, the world from setUp was created before we could capture the logs.
+        with self.assertLogs("Brotato", "DEBUG") as logs:
+            self.world_setup()
+            slot_data = self.world.fill_slot_data()
+
+        records = {
+            record.brotato_stage["stage"]: record.brotato_stage  # type: ignore
+            for record in logs.records
+            if hasattr(record, STAGE_RECORD_ATTRIBUTE)
+        }
+        self.assertEqual(
+            set(records), {"generate_early", "create_regions", "create_items", "set_rules", "fill_slot_data"}
+        )
+        regions = self.multiworld.get_regions(self.player)
+        self.assertEqual(records["create_regions"]["regions"], len(regions))
+        self.assertEqual(records["create_regions"]["locations"], len(self.multiworld.get_locations(self.player)))
+        self.assertEqual(records["create_regions"]["entrances"], sum(len(r.exits) for r in regions))
+        self.assertEqual(records["create_items"]["items"], len(self.multiworld.itempool))
+        self.assertEqual(records["fill_slot_data"]["slot_data_keys"], len(slot_data))
+        self.assertEqual(records["set_rules"]["player"], self.player)
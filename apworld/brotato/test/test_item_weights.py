@@ -1,3 +1,5 @@
+import math
+from collections import Counter
 from random import Random
 from typing import ClassVar
 from unittest import TestCase
@@ -5,7 +7,7 @@ from unittest import TestCase
 from Options import OptionError, Range
 
 from .. import options
-from ..item_weights import create_items_from_weights
+from ..item_weights import create_items_from_weights, sample_items_from_weights
 from ..items import ItemName, item_name_groups
 
 
@@ -109,3 +111,97 @@ class TestBrotatoItemWeights(TestCase):
         for expected_items in self.option_to_expected_items.values():
             for item in expected_items:
                 self.assertIn(item, item_names, f"No items created for {item}.")
+
+
+class TestSampleItemsFromWeights(TestCase):
+    """Check that sampling the item counts directly gives the same distribution as choosing each item individually.
+
+    The counts from choosing num_items items one at a time follow a multinomial distribution, so the count of item i,
+    with probability p_i = weight_i / total_weight, has mean num_items * p_i and variance num_items * p_i * (1 - p_i).
+    Over many samples the mean and variance of each count from sample_items_from_weights should match these. The
+    random generator is seeded, so this is deterministic, and the tolerances are loose enough (more than 5 standard
+    errors) that a correct sampler won't fail on a different seed either.
+    """
+
+    item_names: ClassVar[tuple[ItemName, ...]] = (
+        ItemName.COMMON_ITEM,
+        ItemName.UNCOMMON_ITEM,
+        ItemName.RARE_ITEM,
+        ItemName.LEGENDARY_ITEM,
+        ItemName.COMMON_UPGRADE,
+    )
+    item_weights: ClassVar[tuple[int, ...]] = (50, 0, 30, 1, 19)
+    num_items: ClassVar[int] = 200
+    num_samples: ClassVar[int] = 4000
+
+    def _sample_counts(self, legacy_sampling: bool) -> list[dict[ItemName, int]]:
+        random = Random(0x5A3D)
+        return [
+            sample_items_from_weights(
+                self.num_items, random, self.item_names, self.item_weights, legacy_sampling=legacy_sampling
+            )
+            for _ in range(self.num_samples)
+        ]
+
+    def test_counts_sum_to_num_items(self):
+        for sample in self._sample_counts(legacy_sampling=False):
+            self.assertEqual(sum(sample.values()), self.num_items)
+            self.assertNotIn(ItemName.UNCOMMON_ITEM, sample, "Chose an item with a weight of 0.")
+            self.assertNotIn(0, sample.values(), "Included an item which wasn't chosen.")
+
+    def test_mean_and_variance_match_multinomial(self):
+        samples = self._sample_counts(legacy_sampling=False)
+        total_weight = sum(self.item_weights)
+        for item_name, weight in zip(self.item_names, self.item_weights, strict=True):
+            with self.subTest(item_name=item_name):
+                p = weight / total_weight
+                expected_mean = self.num_items * p
+                expected_variance = self.num_items * p * (1 - p)
+                counts = [sample.get(item_name, 0) for sample in samples]
+                mean = sum(counts) / self.num_samples
+                variance = sum((c - mean) ** 2 for c in counts) / (self.num_samples - 1)
+
+                # The standard error of the mean is sqrt(variance / n). For the variance, use the normal approximation
+                # sqrt(2 / (n - 1)) * variance, which is close enough for a tolerance.
+                mean_tolerance = 6 * math.sqrt(expected_variance / self.num_samples) + 1e-9
+                variance_tolerance = 6 * math.sqrt(2 / (self.num_samples - 1)) * expected_variance + 1e-9
+                self.assertAlmostEqual(mean, expected_mean, delta=mean_tolerance)
+                self.assertAlmostEqual(variance, expected_variance, delta=variance_tolerance)
+
+    def test_matches_legacy_sampling_distribution(self):
+        # Compare the total number of each item over all the samples, which should be close for both samplers.
+        new_totals: Counter[ItemName] = Counter()
+        legacy_totals: Counter[ItemName] = Counter()
+        for sample in self._sample_counts(legacy_sampling=False):
+            new_totals.update(sample)
+        for sample in self._sample_counts(legacy_sampling=True):
+            legacy_totals.update(sample)
+
+        total_weight = sum(self.item_weights)
+        total_items = self.num_items * self.num_samples
+        for item_name, weight in zip(self.item_names, self.item_weights, strict=True):
+            with self.subTest(item_name=item_name):
+                p = weight / total_weight
+                # Each total has a variance of total_items * p * (1 - p), so their difference has double that.
+                tolerance = 6 * math.sqrt(2 * total_items * p * (1 - p)) + 1e-9
+                self.assertAlmostEqual(new_totals[item_name], legacy_totals[item_name], delta=tolerance)
+
+    def test_legacy_sampling_is_reproducible(self):
+        # Legacy sampling must keep giving the same result as random.choices did, to reproduce older seeds.
+        expected = Counter(Random(0x1234).choices(self.item_names, weights=self.item_weights, k=self.num_items))
+        actual = sample_items_from_weights(
+            self.num_items, Random(0x1234), self.item_names, self.item_weights, legacy_sampling=True
+        )
+        self.assertDictEqual(dict(actual), dict(expected))
+
+    def test_sampling_is_reproducible(self):
+        # The same seed must create the same items on every Python version, so hardcode the expected counts instead of
+        # comparing to Random.binomialvariate, which older versions don't have.
+        expected = {
+            ItemName.COMMON_ITEM: 2565,
+            ItemName.RARE_ITEM: 1477,
+            ItemName.LEGENDARY_ITEM: 48,
+            ItemName.COMMON_UPGRADE: 910,
+        }
+        actual = sample_items_from_weights(5000, Random(0x1234), self.item_names, self.item_weights)
+        self.assertDictEqual(actual, expected)
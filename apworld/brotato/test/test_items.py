@@ -22,3 +22,22 @@ class TestBrotatoItems(BrotatoTestBase):
                     item_counts[self.world.create_item(ItemName.SHOP_LOCK_BUTTON)],
                     test_case.expected_num_lock_button_items,
                 )
+
+    def test_create_item_accepts_name_or_string(self):
+        for item_name in ItemName:
+            with self.subTest(item_name=item_name):
+                item = self.world.create_item(item_name)
+                self.assertEqual(item, self.world.create_item(item_name.value))
+                self.assertEqual(item.code, self.world.item_name_to_id[item_name.value])
+
+    def test_create_items_bulk_matches_create_item(self):
+        for item_name in ItemName:
+            with self.subTest(item_name=item_name):
+                expected_item = self.world.create_item(item_name)
+                items = self.world.create_items_bulk(item_name, 3)
+                self.assertEqual(len(items), 3)
+                for item in items:
+                    self.assertEqual(item, expected_item)
+                    self.assertEqual(item.classification, expected_item.classification)
+                # Each item must be a distinct object, since AP assigns each one a location.
+                self.assertEqual(len({id(item) for item in items}), 3)
@@ -0,0 +1,197 @@
+from collections import Counter
+from random import Random
+from typing import Any, ClassVar
+from unittest import TestCase
+
+from BaseClasses import Item, ItemClassification, Location
+from worlds.AutoWorld import call_all
+
+from ..items import ItemName
+from ..local_filler import get_num_local_filler, place_local_filler
+from ..locations import BrotatoCommonCrateLocation, BrotatoLegendaryCrateLocation
+from . import BrotatoTestBase
+
+_GOLD_ITEMS: frozenset[str] = frozenset(name.value for name in ItemName if name.value.startswith("Gold"))
+
+# Only create gold and XP, so every nonessential item is filler.
+_ONLY_FILLER_OPTIONS: dict[str, Any] = {
+    "common_item_weight": 0,
+    "uncommon_item_weight": 0,
+    "rare_item_weight": 0,
+    "legendary_item_weight": 0,
+    "common_upgrade_weight": 0,
+    "uncommon_upgrade_weight": 0,
+    "rare_upgrade_weight": 0,
+    "legendary_upgrade_weight": 0,
+    "gold_weight": 1,
+    "xp_weight": 1,
+}
+
+
+class TestGetNumLocalFiller(TestCase):
+    def test_percent_of_filler(self):
+        self.assertEqual(get_num_local_filler(200, 0, 100), 0)
+        self.assertEqual(get_num_local_filler(200, 25, 100), 50)
+        # Rounds down, so it's never more than the percent asked for.
+        self.assertEqual(get_num_local_filler(11, 50, 100), 5)
+
+    def test_limited_to_crate_locations(self):
+        self.assertEqual(get_num_local_filler(200, 100, 30), 30)
+        self.assertEqual(get_num_local_filler(200, 100, 0), 0)
+
+
+class TestPlaceLocalFiller(TestCase):
+    def test_fills_empty_locations_and_returns_leftovers(self):
+        locations = [Location(1, f"Location {idx}") for idx in range(5)]
+        plando_item = Item("Plando", ItemClassification.useful, None, 2)
+        locations[2].place_locked_item(plando_item)
+        items = [Item(f"Filler {idx}", ItemClassification.filler, None, 1) for idx in range(6)]
+
+        leftovers = place_local_filler(items, locations, Random(0))
+
+        self.assertIs(locations[2].item, plando_item)
+        placed_items = [location.item for location in locations if location.item is not plando_item]
+        self.assertEqual(len(leftovers), 2)
+        self.assertCountEqual(placed_items + leftovers, items)
+
+
+class TestLocalFillerInLootCrates(BrotatoTestBase):
+    options: ClassVar[dict[str, Any]] = {**_ONLY_FILLER_OPTIONS, "local_filler_in_loot_crates": 100}
+
+    def _crate_locations(self) -> list[Location]:
+        return [
+            location
+            for location in self.multiworld.get_locations(self.player)
+            if isinstance(location, BrotatoCommonCrateLocation | BrotatoLegendaryCrateLocation)
+        ]
+
+    def test_crate_locations_have_own_filler(self):
+        crate_locations = self._crate_locations()
+        self.assertGreater(len(crate_locations), 0)
+        for location in crate_locations:
+            with self.subTest(location=location.name):
+                self.assertIsNotNone(location.item)
+                self.assertEqual(location.item.player, self.player)  # type: ignore
+                self.assertEqual(location.item.classification, ItemClassification.filler)  # type: ignore
+
+    def test_item_pool_matches_unfilled_locations(self):
+        self.assertEqual(len(self.multiworld.itempool), len(self.multiworld.get_unfilled_locations()))
+
+
+class TestLocalFillerInLootCratesPartial(TestLocalFillerInLootCrates):
+    options: ClassVar[dict[str, Any]] = {
+        **_ONLY_FILLER_OPTIONS,
+        "local_filler_in_loot_crates": 10,
+        "priority_locations": {"Loot Crate 1"},
+        "non_local_items": _GOLD_ITEMS,
+    }
+
+    def test_crate_locations_have_own_filler(self):
+        crate_locations = self._crate_locations()
+        filled_locations = [location for location in crate_locations if location.item is not None]
+        num_local_candidates = sum(
+            count for name, count in self.world.nonessential_item_counts.items() if name.value not in _GOLD_ITEMS
+        )
+        self.assertGreater(num_local_candidates * 10 // 100, 0, "Options should set aside at least one item.")
+        self.assertEqual(len(filled_locations), get_num_local_filler(num_local_candidates, 10, len(crate_locations)))
+        for location in filled_locations:
+            with self.subTest(location=location.name):
+                self.assertEqual(location.item.player, self.player)  # type: ignore
+                self.assertNotIn(location.item.name, _GOLD_ITEMS)  # type: ignore
+
+    def test_priority_locations_not_filled(self):
+        self.assertIsNone(self.multiworld.get_location("Loot Crate 1", self.player).item)
+
+
+class TestLocalFillerInLootCratesItemPool(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+    cache_worlds = False
+    # More filler than crate locations, so every crate location which isn't a priority location is used.
+    options: ClassVar[dict[str, Any]] = {
+        **_ONLY_FILLER_OPTIONS,
+        "local_filler_in_loot_crates": 100,
+        "priority_locations": {"Loot Crate 1", "Legendary Loot Crate 1"},
+    }
+    # Stop before pre_fill, so the tests can change the item pool and locations first, like Archipelago does.
+    gen_steps = ("generate_early", "create_regions", "create_items", "set_rules", "connect_entrances", "generate_basic")
+
+    def _pool_ids(self) -> set[int]:
+        return {id(item) for item in self.multiworld.itempool}
+
+    def _assert_items_match_locations(self):
+        self.assertEqual(len(self.multiworld.itempool), len(self.multiworld.get_unfilled_locations()))
+
+    def test_local_filler_stays_in_item_pool_until_pre_fill(self):
+        crate_locations = self.world._get_local_filler_locations()
+        local_filler = list(self.world._local_filler)
+        self.assertEqual(len(local_filler), len(crate_locations))
+        self.assertLessEqual({id(item) for item in local_filler}, self._pool_ids())
+
+        call_all(self.multiworld, "pre_fill")
+
+        self.assertFalse({id(item) for item in local_filler} & self._pool_ids())
+        for location in crate_locations:
+            with self.subTest(location=location.name):
+                self.assertIn(location.item, local_filler)
+        for location_name in self.options["priority_locations"]:
+            self.assertIsNone(self.multiworld.get_location(location_name, self.player).item)
+        self._assert_items_match_locations()
+
+    def test_plando_leftovers_stay_in_item_pool(self):
+        local_filler = list(self.world._local_filler)
+        local_filler_ids = {id(item) for item in local_filler}
+        # Plando takes its items out of the item pool.
+        plando_items = [item for item in self.multiworld.itempool if id(item) not in local_filler_ids][:3]
+        for location, item in zip(self.world._get_local_filler_locations(), plando_items, strict=False):
+            self.multiworld.itempool.remove(item)
+            location.place_locked_item(item)
+
+        call_all(self.multiworld, "pre_fill")
+
+        leftovers = [item for item in local_filler if item.location is None]
+        self.assertEqual(len(leftovers), len(plando_items))
+        self.assertLessEqual({id(item) for item in leftovers}, self._pool_ids())
+        self._assert_items_match_locations()
+
+    def test_start_inventory_from_pool(self):
+        # Start with every copy of the items chosen as local filler, so they must all be found in the item pool.
+        local_filler_names = {item.name for item in self.world._local_filler}
+        start_inventory = Counter(
+            {
+                item_name.value: count
+                for item_name, count in self.world.nonessential_item_counts.items()
+                if item_name.value in local_filler_names
+            }
+        )
+        # Do what Archipelago's Main.py does for start_inventory_from_pool after create_items: take the first items with
+        # the names from the pool, then add the world's filler in their place.
+        new_item_pool: list[Item] = []
+        for item in self.multiworld.itempool:
+            if item.player == self.player and start_inventory[item.name] > 0:
+                start_inventory[item.name] -= 1
+                self.multiworld.push_precollected(item)
+            else:
+                new_item_pool.append(item)
+        num_removed = len(self.multiworld.itempool) - len(new_item_pool)
+        new_item_pool += [self.world.create_filler() for _ in range(num_removed)]
+        self.multiworld.itempool[:] = new_item_pool
+
+        self.assertFalse(+start_inventory, "Items weren't in the item pool.")
+
+        call_all(self.multiworld, "pre_fill")
+
+        for item in self.multiworld.precollected_items[self.player]:
+            with self.subTest(item=item.name):
+                self.assertIsNone(item.location)
+        self._assert_items_match_locations()
+
+
+class TestLocalFillerInLootCratesDisabled(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+    options: ClassVar[dict[str, Any]] = _ONLY_FILLER_OPTIONS
+
+    def test_crate_locations_not_filled(self):
+        for location in self.multiworld.get_locations(self.player):
+            if isinstance(location, BrotatoCommonCrateLocation | BrotatoLegendaryCrateLocation):
+                with self.subTest(location=location.name):
+                    self.assertIsNone(location.item)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from .. import items, locations
+from ..constants import ALL_CHARACTERS, NUM_WAVES, RUN_COMPLETE_LOCATION_TEMPLATE, WAVE_COMPLETE_LOCATION_TEMPLATE
+
+
+class TestLocationAndItemTables(TestCase):
+    def test_location_ids_are_unchanged(self):
+        # Changing location IDs breaks existing multiworlds, so spot check some known IDs.
+        expected_ids = {
+            "Wave 1 Completed (Well Rounded)": 4108320768,
+            "Run Won (Well Rounded)": 4108320788,
+            "Wave 1 Completed (Baby)": 4108321692,
+            "Run Won (Romantic)": 4108322111,
+            "Loot Crate 1": 4108322112,
+            "Legendary Loot Crate 50": 4108322211,
+        }
+        for location_name, expected_id in expected_ids.items():
+            with self.subTest(location_name=location_name):
+                self.assertEqual(locations.location_name_to_id[location_name], expected_id)
+
+    def test_item_ids_are_unchanged(self):
+        expected_ids = {"Common Item": 2054160384, "Run Won": 2054160405, "Well Rounded": 2054160406}
+        for item_name, expected_id in expected_ids.items():
+            with self.subTest(item_name=item_name):
+                self.assertEqual(items.item_name_to_id[item_name], expected_id)
+
+    def test_location_table_matches_location_name_to_id(self):
+        self.assertEqual(
+            {name: location.id for name, location in locations.location_table.items()},
+            locations.location_name_to_id,
+        )
+
+    def test_character_location_tables_match_location_name_to_id(self):
+        for character in ALL_CHARACTERS:
+            with self.subTest(character=character):
+                wave_complete_locations = locations.wave_complete_locations_by_character[character]
+                self.assertEqual(len(wave_complete_locations), NUM_WAVES)
+                for wave, (location_name, location_id) in enumerate(wave_complete_locations, start=1):
+                    self.assertEqual(location_name, WAVE_COMPLETE_LOCATION_TEMPLATE.format(wave=wave, char=character))
+                    self.assertEqual(location_id, locations.location_name_to_id[location_name])
+
+                run_won_location_name, run_won_location_id = locations.run_won_location_by_character[character]
+                self.assertEqual(run_won_location_name, RUN_COMPLETE_LOCATION_TEMPLATE.format(char=character))
+                self.assertEqual(run_won_location_id, locations.location_name_to_id[run_won_location_name])
+
+    def test_item_tables_match_item_name_to_id(self):
+        for item_name in items.ItemName:
+            with self.subTest(item_name=item_name):
+                item_id = items.item_name_to_id[item_name.value]
+                self.assertEqual(items.item_table[item_id].name, item_name)
+                self.assertEqual(items.item_prototypes[item_name].code, item_id)
+                self.assertIs(items.item_prototypes[item_name], items.item_prototypes[item_name.value])
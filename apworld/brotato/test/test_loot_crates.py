@@ -1,6 +1,14 @@
+import itertools
 from unittest import TestCase
 
-from ..loot_crates import build_loot_crate_groups
+from ..constants import (
+    MAX_LEGENDARY_CRATE_DROP_GROUPS,
+    MAX_LEGENDARY_CRATE_DROPS,
+    MAX_NORMAL_CRATE_DROP_GROUPS,
+    MAX_NORMAL_CRATE_DROPS,
+    TOTAL_NUM_CHARACTERS,
+)
+from ..loot_crates import build_loot_crate_groups, get_loot_crate_groups
 from .data_sets.loot_crates import LOOT_CRATE_GROUP_DATA_SETS
 
 
@@ -40,3 +48,38 @@ class TestLootCrateGroups(TestCase):
                     zip(legendary_loot_crate_groups, test_data.expected_legendary_groups, strict=True)
                 ):
                     self.assertEqual(group, expected_group, msg=f"Mismatch for group {idx}.")
+
+
+class TestGetLootCrateGroups(TestCase):
+    def test_matches_build_loot_crate_groups_for_every_input(self):
+        # Every value the options allow. The common and legendary limits are the same now, but might not stay that way.
+        # Skip the cache, so this doesn't fill it with every layout.
+        get_uncached = get_loot_crate_groups.__wrapped__
+        max_num_crates = max(MAX_NORMAL_CRATE_DROPS, MAX_LEGENDARY_CRATE_DROPS)
+        max_num_groups = max(MAX_NORMAL_CRATE_DROP_GROUPS, MAX_LEGENDARY_CRATE_DROP_GROUPS)
+        mismatches: list[tuple[int, int, int]] = []
+        for num_victories in range(1, TOTAL_NUM_CHARACTERS + 1):
+            # Both implementations clamp the number of groups to the number of victories before anything else, so
+            # there's no need to check each larger number of groups. test_more_groups_than_victories checks the clamp.
+            for num_crates, num_groups in itertools.product(
+                range(max_num_crates + 1), range(1, min(max_num_groups, num_victories) + 1)
+            ):
+                expected = tuple(build_loot_crate_groups(num_crates, num_groups, num_victories))
+                if get_uncached(num_crates, num_groups, num_victories) != expected:
+                    mismatches.append((num_crates, num_groups, num_victories))
+        # Collect the mismatches instead of using subTest, which is slow with this many cases.
+        self.assertListEqual(mismatches, [], "Mismatches for (num_crates, num_groups, num_victories)")
+
+    def test_more_groups_than_victories(self):
+        get_uncached = get_loot_crate_groups.__wrapped__
+        for num_victories in (1, 7, 20):
+            for num_crates in range(MAX_NORMAL_CRATE_DROPS + 1):
+                with self.subTest(num_victories=num_victories, num_crates=num_crates):
+                    expected = tuple(build_loot_crate_groups(num_crates, MAX_NORMAL_CRATE_DROP_GROUPS, num_victories))
+                    self.assertEqual(get_uncached(num_crates, MAX_NORMAL_CRATE_DROP_GROUPS, num_victories), expected)
+                    self.assertEqual(get_uncached(num_crates, num_victories, num_victories), expected)
+
+    def test_returns_shared_tuple(self):
+        groups = get_loot_crate_groups(20, 5, 10)
+        self.assertIsInstance(groups, tuple)
+        self.assertIs(get_loot_crate_groups(20, 5, 10), groups)
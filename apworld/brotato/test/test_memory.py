@@ -0,0 +1,73 @@
+import random
+import tracemalloc
+from argparse import Namespace
+from typing import Any, ClassVar
+
+from BaseClasses import CollectionState, MultiWorld
+from Generate import get_seed_name
+from worlds.AutoWorld import call_all
+
+from .. import BrotatoWorld
+from ..constants import MAX_LEGENDARY_CRATE_DROPS, MAX_NORMAL_CRATE_DROPS, TOTAL_NUM_CHARACTERS
+from . import BrotatoTestBase
+
+# A slot with the options below uses roughly 0.5 MB. The budget leaves headroom for differences between
+# Archipelago versions, but should catch something like every location or item gaining a few more attributes.
+MEMORY_BUDGET_PER_SLOT_BYTES = 1_000_000
+
+
+class TestBrotatoMemory(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+    num_players: ClassVar[int] = 4
+    # The options which create the most locations and items.
+    options: ClassVar[dict[str, Any]] = {
+        "num_characters": TOTAL_NUM_CHARACTERS,
+        "num_victories": TOTAL_NUM_CHARACTERS,
+        "enable_abyssal_terrors_dlc": True,
+        "waves_per_drop": 1,
+        "num_common_crate_drops": MAX_NORMAL_CRATE_DROPS,
+        "num_common_crate_drop_groups": MAX_NORMAL_CRATE_DROPS,
+        "num_legendary_crate_drops": MAX_LEGENDARY_CRATE_DROPS,
+        "num_legendary_crate_drop_groups": MAX_LEGENDARY_CRATE_DROPS,
+    }
+
+    def _create_multiworld(self) -> MultiWorld:
+        """Like WorldTestBase.world_setup, but with multiple players and without running any steps."""
+        multiworld = MultiWorld(self.num_players)
+        multiworld.game = dict.fromkeys(multiworld.player_ids, self.game)
+        multiworld.player_name = {player: f"Tester{player}" for player in multiworld.player_ids}
+        multiworld.set_seed(None)
+        random.seed(multiworld.seed)
+        multiworld.seed_name = get_seed_name(random)
+        args = Namespace()
+        for name, option in BrotatoWorld.options_dataclass.type_hints.items():
+            value = self.options.get(name, option.default)
+            setattr(args, name, {player: option.from_any(value) for player in multiworld.player_ids})
+        multiworld.set_options(args)
+        multiworld.state = CollectionState(multiworld)
+        return multiworld
+
+    def test_items_have_no_instance_dict(self):
+        item = self.world.create_item("Common Item")
+        self.assertFalse(hasattr(item, "__dict__"))
+
+    def test_memory_per_slot_within_budget(self):
+        # The world from setUp has already built the tables and caches which are shared between multiworlds, so they
+        # aren't counted against each slot here.
+        multiworld = self._create_multiworld()
+        call_all(multiworld, "generate_early")
+
+        tracemalloc.start()
+        try:
+            for step in ("create_regions", "create_items", "set_rules"):
+                call_all(multiworld, step)
+            allocated_bytes, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        bytes_per_slot = allocated_bytes / self.num_players
+        self.assertLessEqual(
+            bytes_per_slot,
+            MEMORY_BUDGET_PER_SLOT_BYTES,
+            f"Each slot used {bytes_per_slot:,.0f} bytes, over the budget of {MEMORY_BUDGET_PER_SLOT_BYTES:,} bytes.",
+        )
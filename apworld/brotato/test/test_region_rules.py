@@ -0,0 +1,86 @@
+import itertools
+from unittest import TestCase
+
+from ..constants import (
+    ALL_CHARACTERS,
+    CHARACTER_REGION_TEMPLATE,
+    CRATE_DROP_GROUP_REGION_TEMPLATE,
+    LEGENDARY_CRATE_DROP_GROUP_REGION_TEMPLATE,
+    MAX_NORMAL_CRATE_DROPS,
+    NUM_WAVES,
+    TOTAL_NUM_CHARACTERS,
+)
+from ..logic import RUN_WON_ITEM_NAME
+from ..loot_crates import get_loot_crate_groups
+from ..options import WavesPerCheck
+from ..regions import create_regions
+from ..waves import get_waves_with_checks
+from .stubs import FakeCollectionState, StubRegionFactory, reachable_regions
+
+
+class TestRegionRulesWithStubs(TestCase):
+    """Check the region graph and access rules from create_regions over many option combinations.
+
+    These use the stubs from stubs.py instead of generating a world, so each combination only takes a fraction of a
+    millisecond. See test_regions.py and test_world_regions.py for the same checks on generated worlds.
+    """
+
+    def test_loot_crate_group_regions_need_wins_to_unlock(self):
+        for num_victories, num_crates, num_groups in itertools.product(
+            (1, 2, 5, 10, 33, TOTAL_NUM_CHARACTERS), (1, 7, 25, MAX_NORMAL_CRATE_DROPS), (1, 3, 10, 50)
+        ):
+            common_groups = get_loot_crate_groups(num_crates, num_groups, num_victories)
+            # Use a different layout for the legendary crates, so they can't pass by using the common crate rules.
+            legendary_groups = get_loot_crate_groups(max(num_crates // 2, 1), max(num_groups // 2, 1), num_victories)
+            factory = StubRegionFactory()
+            create_regions(factory, ["Brawler"], [NUM_WAVES], common_groups, legendary_groups)
+            menu = factory.regions["Menu"]
+
+            for region_template, groups in (
+                (CRATE_DROP_GROUP_REGION_TEMPLATE, common_groups),
+                (LEGENDARY_CRATE_DROP_GROUP_REGION_TEMPLATE, legendary_groups),
+            ):
+                for group in groups:
+                    region_name = region_template.format(num=group.index)
+                    with self.subTest(
+                        region=region_name, num_victories=num_victories, num_crates=num_crates, num_groups=num_groups
+                    ):
+                        state = FakeCollectionState()
+                        state.collect(RUN_WON_ITEM_NAME, group.wins_to_unlock)
+                        self.assertIn(region_name, reachable_regions(menu, state))
+                        if group.wins_to_unlock > 0:
+                            state.remove(RUN_WON_ITEM_NAME)
+                            self.assertNotIn(region_name, reachable_regions(menu, state))
+
+    def test_character_regions_need_character(self):
+        # Windows of characters from both the base game and the DLC.
+        for start, num_characters in itertools.product(range(0, TOTAL_NUM_CHARACTERS, 7), (1, 5, 20)):
+            characters = ALL_CHARACTERS[start : start + num_characters]
+            factory = StubRegionFactory()
+            create_regions(factory, characters, [NUM_WAVES], [], [])
+            menu = factory.regions["Menu"]
+            state = FakeCollectionState()
+            with self.subTest(characters=characters):
+                self.assertSetEqual(reachable_regions(menu, state), {"Menu"})
+                for idx, character in enumerate(characters, start=1):
+                    state.collect(character)
+                    expected_regions = {"Menu", *(CHARACTER_REGION_TEMPLATE.format(char=c) for c in characters[:idx])}
+                    self.assertSetEqual(reachable_regions(menu, state), expected_regions)
+                # Character items don't stack, so removing one copy of a duplicate keeps the character unlocked.
+                state.collect(characters[0])
+                state.remove(characters[0])
+                self.assertIn(CHARACTER_REGION_TEMPLATE.format(char=characters[0]), reachable_regions(menu, state))
+
+    def test_regions_have_expected_number_of_locations(self):
+        for waves_per_check, num_crates, num_groups in itertools.product(
+            range(1, NUM_WAVES + 1), (1, 25, MAX_NORMAL_CRATE_DROPS), (1, 10)
+        ):
+            waves_with_checks = get_waves_with_checks(WavesPerCheck(waves_per_check))
+            groups = get_loot_crate_groups(num_crates, num_groups, 10)
+            factory = StubRegionFactory()
+            regions, run_won_locations = create_regions(factory, ALL_CHARACTERS, waves_with_checks, groups, groups)
+            with self.subTest(waves_per_check=waves_per_check, num_crates=num_crates, num_groups=num_groups):
+                num_locations = sum(len(region.locations) for region in regions)
+                expected_num_locations = TOTAL_NUM_CHARACTERS * (1 + len(waves_with_checks)) + 2 * num_crates
+                self.assertEqual(num_locations, expected_num_locations)
+                self.assertEqual(len(run_won_locations), TOTAL_NUM_CHARACTERS)
@@ -1,6 +1,6 @@
 from typing import Any, ClassVar
 
-from BaseClasses import MultiWorld, Region
+from BaseClasses import Location, MultiWorld, Region
 from test.bases import WorldTestBase
 
 from .. import BrotatoWorld
@@ -104,6 +104,7 @@ class TestBrotatoLootCrateRegions(TestBrotatoRegions):
 class TestBrotatoCreateRegions(TestBrotatoRegions):
     parent_region: Region
     regions: dict[str, Region]
+    run_won_locations: list[Location]
 
     characters: list[str] = ("Brawler", "Crazy", "Mage", "Demon")
     common_loot_crate_groups: ClassVar[list[BrotatoLootCrateGroup]] = [
@@ -117,7 +118,7 @@ class TestBrotatoCreateRegions(TestBrotatoRegions):
 
     def setUp(self) -> None:
         super().setUp()
-        regions = create_regions(
+        regions, self.run_won_locations = create_regions(
             self._create_region,
             self.characters,
             self.waves_with_checks,
@@ -171,6 +172,12 @@ class TestBrotatoCreateRegions(TestBrotatoRegions):
                 f"Locations did not match for region '{char_region_name}'",
             )
 
+    def test_run_won_locations_are_returned_in_character_order(self):
+        self.assertEqual(len(self.run_won_locations), len(self.characters))
+        for char, run_won_location in zip(self.characters, self.run_won_locations, strict=True):
+            self.assertEqual(run_won_location.name, RUN_COMPLETE_LOCATION_TEMPLATE.format(char=char))
+            self.assertIs(run_won_location.parent_region, self.regions[CHARACTER_REGION_TEMPLATE.format(char=char)])
+
 
 class TestBrotatoRegionAccessRules(BrotatoTestBase):
     run_default_tests = False  # type:ignore
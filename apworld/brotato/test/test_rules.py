@@ -0,0 +1,56 @@
+from ..items import ItemName
+from ..rules import BrotatoRuleFactory
+from . import BrotatoTestBase
+
+
+class TestBrotatoRuleFactory(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+
+    def test_rules_are_reused(self):
+        factory = BrotatoRuleFactory()
+        self.assertIs(factory.has_run_wins(self.player, 3), factory.has_run_wins(self.player, 3))
+        self.assertIs(factory.has_character(self.player, "Brawler"), factory.has(self.player, "Brawler", 1))
+        self.assertIsNot(factory.has_run_wins(self.player, 3), factory.has_run_wins(self.player, 4))
+        self.assertIsNot(factory.has_run_wins(self.player, 3), factory.has_run_wins(self.player + 1, 3))
+
+    def test_always_true_rules_are_skipped(self):
+        factory = BrotatoRuleFactory()
+        self.assertIsNone(factory.has_run_wins(self.player, 0))
+        self.assertIsNone(factory.has(self.player, "Brawler", 0))
+
+    def test_has_rule_needs_count(self):
+        factory = BrotatoRuleFactory()
+        has_two_wins = factory.has_run_wins(self.player, 2)
+        assert has_two_wins is not None
+        run_won_item = self.world.create_item(ItemName.RUN_COMPLETE)
+
+        self.assertFalse(has_two_wins(self.multiworld.state))
+        self.multiworld.state.collect(run_won_item, prevent_sweep=True)
+        self.assertFalse(has_two_wins(self.multiworld.state))
+        self.multiworld.state.collect(self.world.create_item(ItemName.RUN_COMPLETE), prevent_sweep=True)
+        self.assertTrue(has_two_wins(self.multiworld.state))
+        self.multiworld.state.remove(run_won_item)
+        self.assertFalse(has_two_wins(self.multiworld.state))
+
+    def test_character_rule_follows_collect_and_remove(self):
+        factory = BrotatoRuleFactory()
+        # Use a character that isn't a starting character, so it isn't already collected.
+        character = next(c for c in self.world._include_characters if c not in self.world._starting_characters)
+        has_character = factory.has_character(self.player, character)
+        assert has_character is not None
+        character_item = self.world.create_item(character)
+
+        self.assertFalse(has_character(self.multiworld.state))
+        self.multiworld.state.collect(character_item, prevent_sweep=True)
+        self.assertTrue(has_character(self.multiworld.state))
+        self.multiworld.state.remove(character_item)
+        self.assertFalse(has_character(self.multiworld.state))
+
+    def test_copied_state_keeps_tallies(self):
+        self.multiworld.state.collect(self.world.create_item(ItemName.RUN_COMPLETE), prevent_sweep=True)
+        state_copy = self.multiworld.state.copy()
+        self.assertEqual(state_copy.brotato_run_wins, self.multiworld.state.brotato_run_wins)
+        self.assertEqual(state_copy.brotato_characters, self.multiworld.state.brotato_characters)
+        # The copy must not share the tallies with the original.
+        state_copy.collect(self.world.create_item(ItemName.RUN_COMPLETE), prevent_sweep=True)
+        self.assertNotEqual(state_copy.brotato_run_wins, self.multiworld.state.brotato_run_wins)
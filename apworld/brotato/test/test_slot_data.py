@@ -1,7 +1,17 @@
+import json
+from dataclasses import asdict
 from typing import Any, ClassVar
 
+from ..constants import (
+    MAX_LEGENDARY_CRATE_DROP_GROUPS,
+    MAX_LEGENDARY_CRATE_DROPS,
+    MAX_NORMAL_CRATE_DROP_GROUPS,
+    MAX_NORMAL_CRATE_DROPS,
+    TOTAL_NUM_CHARACTERS,
+)
 from ..options import StartingShopLockButtonsMode
-from ..waves import get_wave_for_each_item
+from ..slot_data import SLOT_DATA_VERSION
+from ..waves import decode_wave_per_game_item, get_wave_for_each_item
 from . import BrotatoTestBase
 from .data_sets.shop_slots import SHOP_SLOT_TEST_DATA_SETS
 
@@ -36,6 +46,19 @@ class TestBrotatoSlotData(BrotatoTestBase):
         "xp_weight": 0,
     }
 
+    def test_slot_data_version(self):
+        slot_data = self.world.fill_slot_data()
+        self.assertEqual(slot_data["slot_data_version"], SLOT_DATA_VERSION)
+
+    def test_slot_data_crate_drop_groups_match_asdict(self):
+        slot_data = self.world.fill_slot_data()
+        self.assertListEqual(
+            slot_data["common_crate_drop_groups"], [asdict(g) for g in self.world.common_loot_crate_groups]
+        )
+        self.assertListEqual(
+            slot_data["legendary_crate_drop_groups"], [asdict(g) for g in self.world.legendary_loot_crate_groups]
+        )
+
     def test_slot_data_num_wins_needed(self):
         slot_data = self.world.fill_slot_data()
         self.assertEqual(slot_data["num_wins_needed"], 10)
@@ -73,3 +96,49 @@ class TestBrotatoSlotData(BrotatoTestBase):
         # Testing get_wave_for_each_item is done elsewhere, we just want to see that the slot data matches.
         expected_wave_per_item = get_wave_for_each_item(self.world.nonessential_item_counts)
         self.assertEqual(slot_data["wave_per_game_item"], expected_wave_per_item)
+        # Released clients can't read the compact form, so it's only sent when asked for.
+        self.assertNotIn("wave_per_game_item_compact", slot_data)
+
+    def test_slot_data_wave_per_game_item_compact(self):
+        with self._run({"compact_slot_data": True}):
+            slot_data = self.world.fill_slot_data()
+            expected_wave_per_item = get_wave_for_each_item(self.world.nonessential_item_counts)
+            self.assertNotIn("wave_per_game_item", slot_data)
+            self.assertEqual(decode_wave_per_game_item(slot_data["wave_per_game_item_compact"]), expected_wave_per_item)
+
+
+# The slot_data with the options below is roughly 8 KB of JSON, about 2 KB of which is the wave_per_game_item lists, or
+# 6 KB with compact_slot_data. This leaves room for a few new keys, but should catch something which grows with the
+# number of locations or items. The default payload is what almost every seed sends, so it gets a budget of its own.
+SLOT_DATA_BUDGET_BYTES = 12_000
+COMPACT_SLOT_DATA_BUDGET_BYTES = 10_000
+
+
+class TestBrotatoSlotDataSize(BrotatoTestBase):
+    run_default_tests = False  # type:ignore
+    # The options which make the largest slot_data.
+    options: ClassVar[dict[str, Any]] = {
+        "num_characters": TOTAL_NUM_CHARACTERS,
+        "num_victories": TOTAL_NUM_CHARACTERS,
+        "enable_abyssal_terrors_dlc": True,
+        "waves_per_drop": 1,
+        "num_common_crate_drops": MAX_NORMAL_CRATE_DROPS,
+        "num_common_crate_drop_groups": MAX_NORMAL_CRATE_DROP_GROUPS,
+        "num_legendary_crate_drops": MAX_LEGENDARY_CRATE_DROPS,
+        "num_legendary_crate_drop_groups": MAX_LEGENDARY_CRATE_DROP_GROUPS,
+    }
+    budget_bytes: ClassVar[int] = SLOT_DATA_BUDGET_BYTES
+
+    def test_slot_data_json_size_within_budget(self):
+        slot_data = self.world.fill_slot_data()
+        num_bytes = len(json.dumps(slot_data).encode())
+        self.assertLessEqual(
+            num_bytes,
+            self.budget_bytes,
+            f"The slot_data is {num_bytes:,} bytes of JSON, over the budget of {self.budget_bytes:,} bytes.",
+        )
+
+
+class TestBrotatoCompactSlotDataSize(TestBrotatoSlotDataSize):
+    options: ClassVar[dict[str, Any]] = {**TestBrotatoSlotDataSize.options, "compact_slot_data": True}
+    budget_bytes: ClassVar[int] = COMPACT_SLOT_DATA_BUDGET_BYTES
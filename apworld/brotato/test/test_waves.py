@@ -1,9 +1,20 @@
+import json
+from math import ceil
 from unittest import TestCase
 
 from ..constants import ItemRarity
 from ..items import ItemName
+from ..locations import location_name_to_id
 from ..options import WavesPerCheck
-from ..waves import get_wave_for_each_item, get_waves_with_checks
+from ..waves import (
+    WAVE_PER_GAME_ITEM_VERSION,
+    decode_wave_per_game_item,
+    encode_wave_per_game_item,
+    generate_waves_per_item,
+    get_wave_for_each_item,
+    get_waves_with_checks,
+    wave_for_item,
+)
 
 
 class TestWavesWithChecks(TestCase):
@@ -132,3 +143,65 @@ class TestGetWaveForEachItem(TestCase):
 
         wave_per_item = get_wave_for_each_item(item_counts)
         self.assertDictEqual(wave_per_item, expected_wave_per_item)
+
+
+def _reference_waves_per_item(num_items: int) -> list[int]:
+    """The original loop implementation of generate_waves_per_item, which the client mod also uses."""
+    values: list[int] = []
+    if num_items > 0:
+        step: float = 20 / num_items
+        wave_value: float = 20
+        while len(values) < num_items:
+            values.append(ceil(wave_value))
+            wave_value -= step
+            wave_value = max(wave_value, 1)
+    return sorted(values)
+
+
+class TestGenerateWavesPerItem(TestCase):
+    # There can't be more items than locations, so this covers every count a world can create.
+    max_num_items = len(location_name_to_id)
+
+    def test_generate_waves_per_item_matches_reference(self):
+        for num_items in range(self.max_num_items + 1):
+            with self.subTest(num_items=num_items):
+                self.assertListEqual(generate_waves_per_item(num_items), _reference_waves_per_item(num_items))
+
+    def test_wave_for_item_matches_reference(self):
+        for num_items in range(1, self.max_num_items + 1):
+            expected_waves = _reference_waves_per_item(num_items)
+            with self.subTest(num_items=num_items):
+                waves = [wave_for_item(index, num_items) for index in range(num_items)]
+                self.assertListEqual(waves, expected_waves)
+
+    def test_wave_for_item_out_of_range(self):
+        for index, num_items in [(-1, 5), (5, 5), (0, 0)]:
+            with self.subTest(index=index, num_items=num_items), self.assertRaises(IndexError):
+                wave_for_item(index, num_items)
+
+
+class TestEncodeWavePerGameItem(TestCase):
+    def test_decode_matches_get_wave_for_each_item(self):
+        # Cover every count up to well past the most items a slot can have, including counts which don't divide evenly
+        # into the number of waves.
+        for count in range(0, 1001):
+            item_counts: dict[ItemName, int] = {
+                ItemName.COMMON_ITEM: count,
+                ItemName.UNCOMMON_ITEM: count // 2,
+                ItemName.RARE_ITEM: count // 3,
+                ItemName.LEGENDARY_ITEM: count // 7,
+            }
+            with self.subTest(count=count):
+                encoded = encode_wave_per_game_item(item_counts)
+                # The slot_data is sent as JSON, so decode what the client would actually receive.
+                decoded = decode_wave_per_game_item(json.loads(json.dumps(encoded)))
+                self.assertDictEqual(decoded, get_wave_for_each_item(item_counts))
+
+    def test_encode_missing_rarity_is_zero(self):
+        encoded = encode_wave_per_game_item({ItemName.RARE_ITEM: 5})
+        self.assertEqual(encoded, {"version": WAVE_PER_GAME_ITEM_VERSION, "counts": [0, 0, 5, 0]})
+        self.assertDictEqual(decode_wave_per_game_item(encoded), get_wave_for_each_item({ItemName.RARE_ITEM: 5}))
+
+    def test_decode_unknown_version_fails(self):
+        with self.assertRaises(ValueError):
+            decode_wave_per_game_item({"version": WAVE_PER_GAME_ITEM_VERSION + 1, "counts": [1, 1, 1, 1]})
@@ -1,4 +1,8 @@
+from functools import cache
+from itertools import accumulate, repeat
 from math import ceil
+from operator import sub
+from typing import Any
 
 from .constants import NUM_WAVES, ItemRarity
 from .items import ItemName
@@ -15,6 +19,57 @@ def get_waves_with_checks(waves_per_check: WavesPerCheck) -> list[int]:
     return list(range(0, NUM_WAVES + 1, waves_per_check.value))[1:]
 
 
+WAVE_PER_GAME_ITEM_VERSION = 1
+"""The version of the compact wave_per_game_item encoding. See encode_wave_per_game_item."""
+
+_item_names_to_rarity: dict[ItemName, ItemRarity] = {
+    ItemName.COMMON_ITEM: ItemRarity.COMMON,
+    ItemName.UNCOMMON_ITEM: ItemRarity.UNCOMMON,
+    ItemName.RARE_ITEM: ItemRarity.RARE,
+    ItemName.LEGENDARY_ITEM: ItemRarity.LEGENDARY,
+}
+
+
+@cache
+def _waves_per_item(num_items: int) -> tuple[int, ...]:
+    if num_items <= 0:
+        return ()
+    # Simple linspace implementation, except we start distributing from the top so there's always at least one wave 20
+    # item. This was originally a loop which subtracted the step from the wave each iteration, and the exact float
+    # rounding of that subtraction decides some of the waves (see wave_for_item), so accumulate() repeats it exactly,
+    # just without the Python loop. The waves only go down, so clamping to 1 can be done after rounding, and reversing
+    # sorts them.
+    step: float = NUM_WAVES / num_items
+    waves = [wave if wave > 1 else 1 for wave in map(ceil, accumulate(repeat(step, num_items - 1), sub, initial=20))]
+    return tuple(reversed(waves))
+
+
+def generate_waves_per_item(num_items: int) -> list[int]:
+    """Evenly distribute the items over 20 waves, then sort so items received are generated with steadily increasing
+    waves (aka they got steadily stronger).
+
+    The result only depends on the number of items, so it's cached. The client mod reimplements this to decode the
+    compact slot_data (see encode_wave_per_game_item), so any change here needs a matching change there, and a new
+    WAVE_PER_GAME_ITEM_VERSION.
+    """
+    return list(_waves_per_item(num_items))
+
+
+def wave_for_item(index: int, num_items: int) -> int:
+    """Get generate_waves_per_item(num_items)[index], usually without creating the list.
+
+    The wave is the exact value NUM_WAVES * (index + 1) / num_items rounded up. When that isn't a whole number, the
+    float error from generate_waves_per_item is far too small to change how it rounds, so it's calculated directly.
+    When it is a whole number, the float error decides whether it's rounded up to the next wave, so look it up.
+    """
+    if not 0 <= index < num_items:
+        raise IndexError(f"Item index {index} out of range for {num_items} items.")
+    numerator = NUM_WAVES * (index + 1)
+    if numerator % num_items:
+        return -(-numerator // num_items)
+    return _waves_per_item(num_items)[index]
+
+
 def get_wave_for_each_item(item_counts: dict[ItemName, int]) -> dict[int, list[int]]:
     """Create the wave each item should be generated with.
 
@@ -30,30 +85,33 @@ def get_wave_for_each_item(item_counts: dict[ItemName, int]) -> dict[int, list[i
     We attempt to equally distribute the items over the 20 waves in a normal run, with a bias towards higher numbers,
     for fun.
     """
-    item_names_to_rarity: dict[ItemName, ItemRarity] = {
-        ItemName.COMMON_ITEM: ItemRarity.COMMON,
-        ItemName.UNCOMMON_ITEM: ItemRarity.UNCOMMON,
-        ItemName.RARE_ITEM: ItemRarity.RARE,
-        ItemName.LEGENDARY_ITEM: ItemRarity.LEGENDARY,
+    # Use a default of 0 in case no items of a tier were created for whatever reason.
+    return {
+        rarity.value: generate_waves_per_item(item_counts.get(name, 0))
+        for name, rarity in _item_names_to_rarity.items()
     }
 
-    def generate_waves_per_item(num_items: int) -> list[int]:
-        """Evenly distribute the items over 20 waves, then sort so items received are generated with steadily
-        increasing waves (aka they got steadily stronger).
-        """
-        values: list[int] = []
-        if num_items > 0:
-            # Simple linspace implementation, except we start distributing from the top so there's always at least one
-            # wave 20 item.
-            step: float = (NUM_WAVES) / num_items
-            wave_value: float = 20
-            while len(values) < num_items:
-                values.append(ceil(wave_value))
-                wave_value -= step
-                wave_value = max(wave_value, 1)
-        return sorted(values)
 
-    # Use a default of 0 in case no items of a tier were created for whatever reason.
+def encode_wave_per_game_item(item_counts: dict[ItemName, int]) -> dict[str, Any]:
+    """Encode the waves from get_wave_for_each_item compactly, for the slot_data.
+
+    The lists from get_wave_for_each_item have an entry for every item, which adds up with lots of locations, and the
+    slot_data is sent every time the client connects. Each list only depends on the number of items of its rarity
+    though, so only the counts are sent, indexed by rarity, and the client rebuilds the lists with the same algorithm.
+    decode_wave_per_game_item does the same in Python.
+    """
+    return {
+        "version": WAVE_PER_GAME_ITEM_VERSION,
+        "counts": [item_counts.get(name, 0) for name in _item_names_to_rarity],
+    }
+
+
+def decode_wave_per_game_item(encoded: dict[str, Any]) -> dict[int, list[int]]:
+    """Rebuild the exact result of get_wave_for_each_item from the output of encode_wave_per_game_item."""
+    version = encoded.get("version")
+    if version != WAVE_PER_GAME_ITEM_VERSION:
+        raise ValueError(f"Unsupported wave_per_game_item version {version}, expected {WAVE_PER_GAME_ITEM_VERSION}.")
     return {
-        rarity.value: generate_waves_per_item(item_counts.get(name, 0)) for name, rarity in item_names_to_rarity.items()
+        rarity.value: generate_waves_per_item(count)
+        for rarity, count in zip(_item_names_to_rarity.values(), encoded["counts"], strict=True)
     }
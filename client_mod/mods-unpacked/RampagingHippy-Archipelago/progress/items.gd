@@ -22,7 +22,9 @@
 extends "res://mods-unpacked/RampagingHippy-Archipelago/progress/_base.gd"
 class_name ApItemsProgress
 
+const LOG_NAME = "RampagingHippy-Archipelago/progress/items"
 const SAVE_DATA_KEY = "progress_items"
+const WAVE_PER_GAME_ITEM_VERSION = 1
 
 signal item_received(item_tier)
 
@@ -72,6 +74,22 @@ func process_ap_item(item_tier: int, player_index: int) -> int:
 		wave = waves_for_item_tier[wave_for_next_item]
 	return wave
 
+static func _generate_waves_per_item(num_items: int) -> Array:
+	## Evenly distribute the items over 20 waves, then sort so items received are
+	## generated with steadily increasing waves.
+	##
+	## This must match generate_waves_per_item in the apworld's waves.py exactly.
+	var values = []
+	if num_items > 0:
+		var step: float = 20.0 / num_items
+		var wave_value: float = 20.0
+		while values.size() < num_items:
+			values.append(int(ceil(wave_value)))
+			wave_value -= step
+			wave_value = max(wave_value, 1.0)
+	values.sort()
+	return values
+
 func on_item_received(item_name: String, _item):
 	if item_name in constants.ITEM_DROP_NAME_TO_TIER:
 		var item_tier = constants.ITEM_DROP_NAME_TO_TIER[item_name]
@@ -82,12 +100,42 @@ func on_item_received(item_name: String, _item):
 		emit_signal("item_received", item_tier)
 
 func on_connected_to_multiworld():
-	# The JSON version of the slot_data converts the integer keys to strings,
-	# since int keys aren't valid JSON. Convert the keys back to ints here for
-	# simplicity.
-	var wave_per_game_item_json = _ap_client.slot_data["wave_per_game_item"]
-	for tier in wave_per_game_item_json:
-		wave_per_game_item[int(tier)] = wave_per_game_item_json[tier]
+	wave_per_game_item = {}
+	var use_compact = false
+	if _ap_client.slot_data.has("wave_per_game_item_compact"):
+		var compact = _ap_client.slot_data["wave_per_game_item_compact"]
+		if int(compact["version"]) != WAVE_PER_GAME_ITEM_VERSION:
+			ModLoaderLog.error(
+				"Unsupported wave_per_game_item version %s" % compact["version"],
+				LOG_NAME
+			)
+		elif compact["counts"].size() < received_items_by_tier.size():
+			# process_ap_item looks up every tier, so don't accept a payload missing any.
+			ModLoaderLog.error(
+				"wave_per_game_item_compact has %d tiers, expected %d" % [
+					compact["counts"].size(), received_items_by_tier.size()
+				],
+				LOG_NAME
+			)
+		else:
+			use_compact = true
+
+	if use_compact:
+		# Newer apworlds can send only the number of items of each tier. Build the
+		# lists the same way the apworld does (see waves.py).
+		var counts = _ap_client.slot_data["wave_per_game_item_compact"]["counts"]
+		for tier in received_items_by_tier:
+			wave_per_game_item[tier] = _generate_waves_per_item(int(counts[tier]))
+	elif _ap_client.slot_data.has("wave_per_game_item"):
+		# Older apworlds, and newer ones by default, send the full lists. The JSON
+		# version of the slot_data converts the integer keys to strings, since int
+		# keys aren't valid JSON. Convert the keys back to ints here for simplicity.
+		var wave_per_game_item_json = _ap_client.slot_data["wave_per_game_item"]
+		for tier in wave_per_game_item_json:
+			wave_per_game_item[int(tier)] = wave_per_game_item_json[tier]
+	else:
+		# Don't guess at a layout we can't read.
+		ModLoaderLog.error("No wave_per_game_item this client can read", LOG_NAME)
 
 	# Clear the received and processed items in case there's data from a previous slot
 	received_items_by_tier = {
@@ -0,0 +1,172 @@
+#!/bin/env python
+"""Time each stage of BrotatoWorld generation over a matrix of option sets.
+
+The option sets are taken from the unit test data sets in apworld/brotato/test/data_sets, so the benchmark covers the
+same option combinations we already test for correctness. For each option set, a multiworld with one or more Brotato
+slots is created and the following stages are run and timed one at a time:
+
+    * generate_early
+    * create_regions
+    * create_items
+    * set_rules
+    * fill_slot_data
+
+Results are written as JSON, with the timings for each stage of each option set. Pass a previous results file with
+"-b/--baseline" to print how much each stage changed compared to that run, e.g. before and after a refactor.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just bench_generation".
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from brotato_multiworld import create_multiworld
+from worlds.AutoWorld import call_all
+from worlds.brotato.test.data_sets.characters import CHARACTER_TEST_DATA_SETS, BrotatoCharacterOptionDataSet
+from worlds.brotato.test.data_sets.loot_crates import LOOT_CRATE_GROUP_DATA_SETS
+from worlds.brotato.test.data_sets.num_characters import NUM_CHARACTERS_DATA_SETS
+from worlds.brotato.test.data_sets.shop_slots import SHOP_SLOT_TEST_DATA_SETS
+
+STAGES: tuple[str, ...] = ("generate_early", "create_regions", "create_items", "set_rules", "fill_slot_data")
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument(
+    "-o",
+    "--output",
+    type=Path,
+    default=Path(".benchmarks/generation.json"),
+    help="Where to write the JSON results. Defaults to %(default)s.",
+)
+parser.add_argument(
+    "-b", "--baseline", type=Path, help="Results from a previous run to compare against. Must use the same options."
+)
+parser.add_argument(
+    "-p", "--players", type=int, default=1, help="The number of Brotato slots in each multiworld. Defaults to 1."
+)
+parser.add_argument(
+    "-r", "--repeat", type=int, default=5, help="How many times to generate each option set. Defaults to 5."
+)
+parser.add_argument("-s", "--seed", type=int, default=0x7A70, help="The multiworld seed. Defaults to %(default)s.")
+parser.add_argument(
+    "-k", "--filter", default="", help="Only run option sets whose name contains this string (case-sensitive)."
+)
+
+
+def _character_options(data_set: BrotatoCharacterOptionDataSet) -> dict[str, Any]:
+    # The character data sets are used to call get_available_and_starting_characters directly, so their field names
+    # don't all match the option names.
+    return {
+        "include_base_game_characters": data_set.include_base_game_characters,
+        "enable_abyssal_terrors_dlc": data_set.enable_abyssal_terrors_dlc,
+        "include_abyssal_terrors_characters": data_set.include_abyssal_terrors_characters,
+        "starting_characters": data_set.starting_characters_mode.value,
+        "num_starting_characters": data_set.num_starting_characters,
+        "num_characters": data_set.num_include_characters,
+    }
+
+
+def get_option_sets() -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield the name and options of each option set to benchmark."""
+    yield "default", {}
+    for loot_crate_data_set in LOOT_CRATE_GROUP_DATA_SETS:
+        yield f"loot_crates/{loot_crate_data_set.test_name}", loot_crate_data_set.options_dict
+    for shop_slot_data_set in SHOP_SLOT_TEST_DATA_SETS:
+        yield f"shop_slots/{shop_slot_data_set.test_name}", shop_slot_data_set.options_dict
+    for num_characters_data_set in NUM_CHARACTERS_DATA_SETS:
+        yield f"num_characters/{num_characters_data_set.test_name}", num_characters_data_set.options_dict
+    for character_data_set in CHARACTER_TEST_DATA_SETS:
+        # Data sets which are expected to fail generation have nothing to time.
+        if character_data_set.expected_exception is None:
+            yield f"characters/{character_data_set.test_name}", _character_options(character_data_set)
+
+
+def time_stages(options: dict[str, Any], num_players: int, seed: int) -> dict[str, int]:
+    """Generate a multiworld and return how long each stage took, in nanoseconds."""
+    multiworld = create_multiworld([options] * num_players, seed)
+    timings: dict[str, int] = {}
+    for stage in STAGES:
+        start = time.perf_counter_ns()
+        if stage == "fill_slot_data":
+            # Not a step Archipelago uses call_all for, it's called for each player when creating the multidata.
+            for world in multiworld.worlds.values():
+                world.fill_slot_data()
+        else:
+            call_all(multiworld, stage)
+        timings[stage] = time.perf_counter_ns() - start
+    return timings
+
+
+def summarize(samples_ns: list[int], num_players: int) -> dict[str, float]:
+    samples_ms = [s / 1_000_000 for s in samples_ns]
+    median_ms = statistics.median(samples_ms)
+    return {
+        "min_ms": min(samples_ms),
+        "median_ms": median_ms,
+        "mean_ms": statistics.fmean(samples_ms),
+        "stdev_ms": statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0,
+        "per_slot_median_ms": median_ms / num_players,
+    }
+
+
+def compare(results: dict[str, dict[str, dict[str, float]]], baseline: dict[str, dict[str, dict[str, float]]]) -> None:
+    """Print the change in median time of each stage, summed over all option sets both runs have in common."""
+    common_option_sets = results.keys() & baseline.keys()
+    if not common_option_sets:
+        print("No option sets in common with the baseline, nothing to compare.")
+        return
+
+    print(f"Compared to baseline ({len(common_option_sets)} option sets in common):")
+    for stage in STAGES:
+        new_total = sum(results[name][stage]["median_ms"] for name in common_option_sets)
+        old_total = sum(baseline[name][stage]["median_ms"] for name in common_option_sets)
+        change = (new_total - old_total) / old_total * 100 if old_total else 0.0
+        print(f"  {stage:<16} {old_total:>10.2f} ms -> {new_total:>10.2f} ms ({change:+.1f}%)")
+
+
+def main() -> None:
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name, options in get_option_sets():
+        if args.filter not in name:
+            continue
+
+        samples: dict[str, list[int]] = {stage: [] for stage in STAGES}
+        for _ in range(args.repeat):
+            for stage, duration in time_stages(options, args.players, args.seed).items():
+                samples[stage].append(duration)
+
+        results[name] = {stage: summarize(stage_samples, args.players) for stage, stage_samples in samples.items()}
+        total_ms = sum(stage_results["median_ms"] for stage_results in results[name].values())
+        print(f"{name}: {total_ms:.2f} ms")
+
+    output = {
+        "metadata": {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "players": args.players,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(output, indent=4))
+    print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["metadata"]["players"] != args.players:
+            print("WARNING: Baseline was run with a different number of players, comparison may be meaningless.")
+        compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
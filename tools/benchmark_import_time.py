@@ -0,0 +1,87 @@
+#!/bin/env python
+"""Measure how long importing worlds.brotato takes, and fail if it goes over a budget.
+
+The launcher, WebHost and every generation import all installed worlds, even when they aren't used, so importing the
+world should stay cheap. This imports the world in a fresh interpreter with "python -X importtime" several times, and
+reports the median cumulative import time of the world and the time spent in each of its modules.
+
+Exits with a non-zero status if the median import time is over the threshold, so this can be used to catch
+regressions, e.g. from a new module-level import of something only needed for generation.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just bench_import".
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+# Lines look like "import time:       123 |        456 |   worlds.brotato.items"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<module>.+)$")
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument(
+    "-m", "--module", default="worlds.brotato", help="The module to measure the import of. Defaults to %(default)s."
+)
+parser.add_argument(
+    "-r", "--repeat", type=int, default=10, help="How many fresh interpreters to measure. Defaults to %(default)s."
+)
+parser.add_argument(
+    "-t",
+    "--threshold-ms",
+    type=float,
+    default=50.0,
+    help="Fail if the median import time is over this many milliseconds. Defaults to %(default)s.",
+)
+
+
+def measure_import(module: str) -> dict[str, tuple[int, int]]:
+    """Import `module` in a new interpreter and return the self and cumulative import time of each module, in us.
+
+    Importing "worlds" loads every installed world, including the one being measured, so Archipelago's own modules are
+    imported before the world and aren't counted against it.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import worlds, {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            timings[match["module"].strip()] = (int(match["self"]), int(match["cumulative"]))
+    return timings
+
+
+def main() -> None:
+    args = parser.parse_args()
+
+    cumulative_samples: list[int] = []
+    self_samples: dict[str, list[int]] = defaultdict(list)
+    for _ in range(args.repeat):
+        timings = measure_import(args.module)
+        if args.module not in timings:
+            parser.error(f"{args.module} was not imported, or was imported before timing started.")
+        cumulative_samples.append(timings[args.module][1])
+        for module, (self_us, _) in timings.items():
+            if module == args.module or module.startswith(f"{args.module}."):
+                self_samples[module].append(self_us)
+
+    median_ms = statistics.median(cumulative_samples) / 1000
+    print(f"{args.module}: median {median_ms:.2f} ms, min {min(cumulative_samples) / 1000:.2f} ms")
+    print("Median self time of each module:")
+    for module, samples in sorted(self_samples.items(), key=lambda kv: statistics.median(kv[1]), reverse=True):
+        print(f"  {module:<40} {statistics.median(samples) / 1000:>8.2f} ms")
+
+    if median_ms > args.threshold_ms:
+        print(f"FAIL: Median import time {median_ms:.2f} ms is over the threshold of {args.threshold_ms:.2f} ms.")
+        sys.exit(1)
+    print(f"OK: Median import time is under the threshold of {args.threshold_ms:.2f} ms.")
+
+
+if __name__ == "__main__":
+    main()
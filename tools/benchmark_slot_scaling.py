@@ -0,0 +1,203 @@
+#!/bin/env python
+"""Check that generating a multiworld scales linearly with the number of Brotato slots.
+
+Multiworlds with an increasing number of Brotato slots are generated, cycling through the option presets below so
+every size has the same mix of small and large worlds. Each is timed through the whole pipeline Archipelago's Main.py
+runs for the worlds, in three parts:
+
+    * steps: generate_early through pre_fill, see brotato_multiworld.GENERATION_STEPS.
+    * fill: Archipelago's distribute_items_restrictive and post_fill.
+    * playthrough: Calculating the spoiler playthrough, which sweeps the filled multiworld repeatedly.
+
+A power law (time = a * slots^k) is then fitted to the total times, or one part's with "--fit-part", by least squares
+on a log-log scale. k is 1 if every slot costs the same no matter how many there are, and above 1 if each slot gets
+more expensive as slots are added. Exits with a non-zero status if k is above "--max-exponent". The default allows a
+little headroom, since fill and the playthrough are themselves slightly super-linear for any game, and timings are
+noisy.
+
+Sizes below "--min-fit-slots" are reported but not fitted, since fixed costs dominate them and would pull k down.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just bench_slot_scaling".
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from brotato_multiworld import create_multiworld, run_steps
+from Fill import distribute_items_restrictive
+from worlds.AutoWorld import call_all
+from worlds.brotato.constants import MAX_LEGENDARY_CRATE_DROPS, MAX_NORMAL_CRATE_DROPS, TOTAL_NUM_CHARACTERS
+
+PRESETS: dict[str, dict[str, Any]] = {
+    "default": {},
+    "short": {
+        "num_characters": 5,
+        "num_victories": 3,
+        "waves_per_drop": 20,
+        "num_common_crate_drops": 5,
+        "num_legendary_crate_drops": 5,
+    },
+    "dlc": {
+        "enable_abyssal_terrors_dlc": True,
+        "num_characters": 20,
+        "num_victories": 15,
+        "waves_per_drop": 5,
+    },
+    "maximal": {
+        "enable_abyssal_terrors_dlc": True,
+        "num_characters": TOTAL_NUM_CHARACTERS,
+        "num_victories": TOTAL_NUM_CHARACTERS,
+        "waves_per_drop": 1,
+        "num_common_crate_drops": MAX_NORMAL_CRATE_DROPS,
+        "num_common_crate_drop_groups": MAX_NORMAL_CRATE_DROPS,
+        "num_legendary_crate_drops": MAX_LEGENDARY_CRATE_DROPS,
+        "num_legendary_crate_drop_groups": MAX_LEGENDARY_CRATE_DROPS,
+    },
+}
+"""Options for the slots, used in turn. Options not given use their defaults."""
+
+PARTS: tuple[str, ...] = ("steps", "fill", "playthrough")
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument(
+    "-n",
+    "--slots",
+    type=int,
+    nargs="+",
+    default=[1, 10, 50, 100, 250, 500],
+    help="The numbers of Brotato slots to generate multiworlds with. Defaults to %(default)s.",
+)
+parser.add_argument(
+    "-r", "--repeat", type=int, default=1, help="How many times to generate each size, using the median. Defaults to 1."
+)
+parser.add_argument("-s", "--seed", type=int, default=0x7A70, help="The multiworld seed. Defaults to %(default)s.")
+parser.add_argument(
+    "--max-exponent",
+    type=float,
+    default=1.15,
+    help="Fail if the fitted exponent is above this. Defaults to %(default)s.",
+)
+parser.add_argument(
+    "--fit-part",
+    choices=(*PARTS, "total"),
+    default="total",
+    help=(
+        'Which part\'s times to fit and check. Use "steps" to only check the work done by the worlds themselves. '
+        "Defaults to %(default)s."
+    ),
+)
+parser.add_argument(
+    "--min-fit-slots",
+    type=int,
+    default=10,
+    help="Only fit sizes with at least this many slots. Defaults to %(default)s.",
+)
+parser.add_argument(
+    "-o",
+    "--output",
+    type=Path,
+    default=Path(".benchmarks/slot_scaling.json"),
+    help="Where to write the JSON results. Defaults to %(default)s.",
+)
+
+
+def get_player_options(num_slots: int) -> list[dict[str, Any]]:
+    presets = list(PRESETS.values())
+    return [presets[idx % len(presets)] for idx in range(num_slots)]
+
+
+def time_generation(num_slots: int, seed: int) -> dict[str, float]:
+    """Generate a multiworld with the given number of slots, and return how long each part took, in seconds."""
+    # Don't let garbage from the previous multiworld be collected during this one.
+    gc.collect()
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    multiworld = create_multiworld(get_player_options(num_slots), seed)
+    run_steps(multiworld)
+    timings["steps"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    distribute_items_restrictive(multiworld)
+    call_all(multiworld, "post_fill")
+    timings["fill"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    multiworld.spoiler.create_playthrough(create_paths=False)
+    timings["playthrough"] = time.perf_counter() - start
+
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def fit_power_law(slots: list[int], times: list[float]) -> tuple[float, float]:
+    """Fit times = a * slots^k by least squares on a log-log scale, and return (k, a)."""
+    slope, intercept = statistics.linear_regression([math.log(s) for s in slots], [math.log(t) for t in times])
+    return slope, math.exp(intercept)
+
+
+def main() -> None:
+    args = parser.parse_args()
+    sizes = sorted(set(args.slots))
+    fit_sizes = [size for size in sizes if size >= args.min_fit_slots]
+    if len(fit_sizes) < 2:
+        parser.error(f"Need at least 2 sizes with {args.min_fit_slots} or more slots to fit the growth curve.")
+
+    # Build the tables and caches shared between multiworlds first, so they don't count against the first size.
+    time_generation(len(PRESETS), args.seed)
+
+    results: dict[int, dict[str, float]] = {}
+    for size in sizes:
+        samples = [time_generation(size, args.seed) for _ in range(args.repeat)]
+        results[size] = {part: statistics.median(sample[part] for sample in samples) for part in (*PARTS, "total")}
+        parts = ", ".join(f"{part} {results[size][part]:.2f} s" for part in PARTS)
+        print(
+            f"{size:>4} slots: {results[size]['total']:>8.2f} s total, "
+            f"{results[size]['total'] / size * 1000:>8.2f} ms per slot ({parts})"
+        )
+
+    exponent, coefficient = fit_power_law(fit_sizes, [results[size][args.fit_part] for size in fit_sizes])
+    part_exponents = {part: fit_power_law(fit_sizes, [results[size][part] for size in fit_sizes])[0] for part in PARTS}
+    print(f"Fitted: {args.fit_part} time = {coefficient * 1000:.2f} ms * slots^{exponent:.3f}")
+    print("Exponent of each part: " + ", ".join(f"{part} {k:.3f}" for part, k in part_exponents.items()))
+
+    output = {
+        "metadata": {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "presets": PRESETS,
+        },
+        "results": {str(size): timings for size, timings in results.items()},
+        "fit": {
+            "part": args.fit_part,
+            "sizes": fit_sizes,
+            "exponent": exponent,
+            "coefficient": coefficient,
+            "parts": part_exponents,
+        },
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(output, indent=4))
+    print(f"Wrote results to {args.output}")
+
+    if exponent > args.max_exponent:
+        print(
+            f"FAIL: {args.fit_part} time grows super-linearly with the number of slots "
+            f"({exponent:.3f} > {args.max_exponent})."
+        )
+        sys.exit(1)
+    print(f"OK: Exponent {exponent:.3f} is within {args.max_exponent}.")
+
+
+if __name__ == "__main__":
+    main()
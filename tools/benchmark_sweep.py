@@ -0,0 +1,83 @@
+#!/bin/env python
+"""Time fill and sweeps of a multiworld with many Brotato slots, with and without the BrotatoLogic counters.
+
+The Brotato access rules check the run-win tally and character bitmask kept on each CollectionState by BrotatoLogic
+(see logic.py). This compares that against the previous approach of checking the item counts in state.prog_items, by
+generating the same multiworld twice:
+
+    * "counter": The world as-is.
+    * "item counts": With BrotatoWorld.collect/remove replaced by World's, and the rules checking the item counts.
+
+For each, the multiworld is filled, then a fresh CollectionState is swept over the filled multiworld several times.
+Both use the same seed, so they should produce the same fill.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just bench_sweep".
+"""
+
+import argparse
+import statistics
+import time
+from contextlib import ExitStack
+from unittest import mock
+
+from BaseClasses import CollectionState, MultiWorld
+from brotato_multiworld import create_multiworld, run_steps
+from Fill import distribute_items_restrictive
+from worlds.AutoWorld import World
+from worlds.brotato import BrotatoWorld
+from worlds.brotato.rules import BrotatoRuleFactory, create_has_rule
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument(
+    "-p", "--players", type=int, default=50, help="The number of Brotato slots in the multiworld. Defaults to 50."
+)
+parser.add_argument(
+    "-r", "--repeat", type=int, default=5, help="How many times to sweep each multiworld. Defaults to 5."
+)
+parser.add_argument("-s", "--seed", type=int, default=0x7A70, help="The multiworld seed. Defaults to %(default)s.")
+
+
+def without_counter() -> ExitStack:
+    """Patch BrotatoWorld to not keep the counters, and its rules to check the item counts instead."""
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(BrotatoWorld, "collect", World.collect))
+    stack.enter_context(mock.patch.object(BrotatoWorld, "remove", World.remove))
+    stack.enter_context(mock.patch.object(BrotatoRuleFactory, "_create_rule", staticmethod(create_has_rule)))
+    return stack
+
+
+def generate_and_fill(num_players: int, seed: int) -> tuple[MultiWorld, int]:
+    """Generate and fill a multiworld, and return it with how long the fill took, in nanoseconds."""
+    multiworld = create_multiworld([{}] * num_players, seed)
+    run_steps(multiworld)
+    start = time.perf_counter_ns()
+    distribute_items_restrictive(multiworld)
+    return multiworld, time.perf_counter_ns() - start
+
+
+def time_sweep(multiworld: MultiWorld) -> int:
+    """Sweep a new state over the whole multiworld, and return how long it took in nanoseconds."""
+    start = time.perf_counter_ns()
+    state = CollectionState(multiworld)
+    state.sweep_for_advancements()
+    return time.perf_counter_ns() - start
+
+
+def run(name: str, num_players: int, seed: int, repeat: int) -> float:
+    multiworld, fill_ns = generate_and_fill(num_players, seed)
+    sweep_ms = statistics.median(time_sweep(multiworld) for _ in range(repeat)) / 1_000_000
+    print(f"{name:<12} fill: {fill_ns / 1_000_000:>10.2f} ms, median sweep: {sweep_ms:>10.2f} ms")
+    return sweep_ms
+
+
+def main() -> None:
+    args = parser.parse_args()
+    print(f"{args.players} Brotato slots, seed {args.seed}:")
+    counter_ms = run("counter", args.players, args.seed, args.repeat)
+    with without_counter():
+        item_counts_ms = run("item counts", args.players, args.seed, args.repeat)
+    print(f"Sweep speedup from the counter: {item_counts_ms / counter_ms:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
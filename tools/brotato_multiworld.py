@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark and stress tools which generate Brotato multiworlds outside of Archipelago's CLI.
+
+These mirror what Archipelago's `WorldTestBase.world_setup` does, but allow creating multiworlds with any number of
+Brotato slots, each with their own options. Like the unit tests, this requires the Archipelago source to be on the
+PYTHONPATH (which the Justfile does for you) and the apworld to be symlinked into it with ./create_dev_symlinks.py.
+"""
+
+import random
+from argparse import Namespace
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from BaseClasses import CollectionState, MultiWorld
+from Generate import get_seed_name
+from worlds.AutoWorld import AutoWorldRegister, call_all
+
+GAME = "Brotato"
+
+GENERATION_STEPS: tuple[str, ...] = (
+    "generate_early",
+    "create_regions",
+    "create_items",
+    "set_rules",
+    "connect_entrances",
+    "generate_basic",
+    "pre_fill",
+)
+"""The steps Archipelago runs on each world before fill, in order."""
+
+
+def create_multiworld(player_options: Sequence[Mapping[str, Any]], seed: int | None = None) -> MultiWorld:
+    """Create a multiworld with one Brotato slot for each entry in `player_options`, without running any steps.
+
+    Each entry only needs to contain the options that differ from the defaults.
+    """
+    num_players = len(player_options)
+    multiworld = MultiWorld(num_players)
+    for player in multiworld.player_ids:
+        multiworld.game[player] = GAME
+    multiworld.player_name = {player: f"Brotato{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+    random.seed(multiworld.seed)
+    multiworld.seed_name = get_seed_name(random)  # Only called to get the same RNG progression as Generate.py
+
+    args = Namespace()
+    options_dataclass = AutoWorldRegister.world_types[GAME].options_dataclass
+    for name, option in options_dataclass.type_hints.items():
+        setattr(
+            args,
+            name,
+            {
+                player: option.from_any(options.get(name, option.default))
+                for player, options in zip(multiworld.player_ids, player_options, strict=True)
+            },
+        )
+    multiworld.set_options(args)
+    multiworld.state = CollectionState(multiworld)
+    return multiworld
+
+
+def run_steps(multiworld: MultiWorld, steps: Sequence[str] = GENERATION_STEPS) -> None:
+    for step in steps:
+        call_all(multiworld, step)
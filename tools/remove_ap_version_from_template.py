@@ -1,24 +1,189 @@
 #!/usr/bin/env python
+"""Remove the "requires.version" key from generated option templates and preset YAMLs.
+
+We build off the Archipelago source, so the version Archipelago writes into the templates usually isn't released yet.
+
+Accepts any number of files or glob patterns (e.g. "presets/**/*.yaml"), and processes them in parallel. The key is
+removed by deleting its line, so the rest of the file, including comments and formatting, is left exactly as it was.
+Files where "requires" isn't a simple block mapping fall back to a full round trip through ruamel.yaml.
+
+The hash of each processed file is saved to a cache file, and files which haven't changed since are skipped. Pass
+"--no-cache" to process every file regardless.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from ruamel.yaml import YAML
+# A top-level "requires:" key, with an optional comment, and its value on the following lines.
+REQUIRES_BLOCK_LINE = re.compile(r"^requires:[ \t]*(#.*)?$")
+# A top-level "requires" key with anything else, like an inline mapping.
+REQUIRES_OTHER_LINE = re.compile(r"^requires[ \t]*:")
+VERSION_LINE = re.compile(r"^(?P<indent>[ \t]+)version[ \t]*:")
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("files", nargs="+", help="The template files, or glob patterns matching them.")
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="The number of processes to use. Defaults to the number of CPUs (%(default)s).",
+)
+parser.add_argument(
+    "-c",
+    "--cache",
+    type=Path,
+    default=Path(".cache/remove_ap_version_from_template.json"),
+    help="Where to keep the hashes of processed files. Defaults to %(default)s.",
+)
+parser.add_argument("--no-cache", action="store_true", help="Process every file, even if it hasn't changed.")
+
+
+class UnsupportedTemplateError(Exception):
+    """The template's "requires" key can't be edited line by line."""
+
 
+def remove_version_lines(text: str) -> str:
+    """Remove the version key from each top-level "requires" block mapping in the YAML text.
+
+    Raises UnsupportedTemplateError if a "requires" key isn't a block mapping, or the version isn't a single line.
+    """
+    lines = text.splitlines(keepends=True)
+    output: list[str] = []
+    idx = 0
+    while idx < len(lines):
+        line = lines[idx]
+        output.append(line)
+        idx += 1
+        stripped = line.rstrip("\r\n")
+        if not REQUIRES_BLOCK_LINE.match(stripped):
+            if REQUIRES_OTHER_LINE.match(stripped):
+                raise UnsupportedTemplateError(f"Unsupported requires line: {stripped!r}")
+            continue
+
+        requires_idx = len(output) - 1
+        num_children = 0
+        removed_version = False
+        child_indent: str | None = None
+        # The block ends at the next line which isn't indented, blank or a comment.
+        while idx < len(lines) and (lines[idx][:1] in (" ", "\t") or not lines[idx].strip()):
+            child = lines[idx]
+            idx += 1
+            child_stripped = child.strip()
+            if not child_stripped or child_stripped.startswith("#"):
+                output.append(child)
+                continue
+            indent = child[: len(child) - len(child.lstrip(" \t"))]
+            if child_indent is None:
+                child_indent = indent
+            if indent == child_indent:
+                match = VERSION_LINE.match(child)
+                if match:
+                    if idx < len(lines) and len(lines[idx]) - len(lines[idx].lstrip(" \t")) > len(indent):
+                        raise UnsupportedTemplateError("The requires.version value spans multiple lines.")
+                    removed_version = True
+                    continue
+                num_children += 1
+            output.append(child)
+
+        if removed_version and num_children == 0:
+            # Keep "requires" a mapping, like deleting the key with ruamel did.
+            newline = line[len(stripped) :]
+            comment = REQUIRES_BLOCK_LINE.match(stripped)[1]  # type: ignore[index]
+            output[requires_idx] = f"requires: {{}}{f' {comment}' if comment else ''}{newline}"
+    return "".join(output)
+
+
+def remove_version_with_ruamel(template_file: Path) -> None:
+    from ruamel.yaml import YAML
 
-def remove_ap_version_from_template(template_file: Path):
     yaml = YAML(typ="rt")
     template_data = yaml.load(template_file)
-
     if "requires" in template_data:
-        del template_data["requires"]["version"]
-
+        template_data["requires"].pop("version", None)
     yaml.dump(template_data, template_file)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print(f"Usage: python {sys.argv[0]} <template_file>")
+def remove_ap_version_from_template(template_file: Path) -> bool:
+    """Remove requires.version from the template, and return whether the file was changed."""
+    with template_file.open(encoding="utf-8", newline="") as f:
+        text = f.read()
+    try:
+        new_text = remove_version_lines(text)
+    except UnsupportedTemplateError:
+        remove_version_with_ruamel(template_file)
+        with template_file.open(encoding="utf-8", newline="") as f:
+            return f.read() != text
+    if new_text == text:
+        return False
+    with template_file.open("w", encoding="utf-8", newline="") as f:
+        f.write(new_text)
+    return True
+
+
+def expand_files(patterns: list[str]) -> list[Path]:
+    files: dict[Path, None] = {}  # Ordered and without duplicates
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        files.update(dict.fromkeys(Path(m).resolve() for m in sorted(matches)))
+    return list(files)
+
+
+def hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_cache(cache_file: Path) -> dict[str, str]:
+    try:
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main() -> None:
+    args = parser.parse_args()
+    files = expand_files(args.files)
+    missing_files = [f for f in files if not f.is_file()]
+    if missing_files:
+        parser.error(f"Files not found: {', '.join(str(f) for f in missing_files)}")
+
+    cache = {} if args.no_cache else load_cache(args.cache)
+    file_hashes = {f: hash_file(f) for f in files}
+    files_to_process = [f for f in files if cache.get(str(f)) != file_hashes[f]]
+
+    num_changed = 0
+    failed = False
+    if files_to_process:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(files_to_process))) as executor:
+            futures = {f: executor.submit(remove_ap_version_from_template, f) for f in files_to_process}
+        for template_file, future in futures.items():
+            try:
+                changed = future.result()
+            except Exception as ex:
+                print(f"{template_file}: {type(ex).__name__}: {ex}", file=sys.stderr)
+                cache.pop(str(template_file), None)
+                failed = True
+                continue
+            num_changed += changed
+            cache[str(template_file)] = hash_file(template_file)
+
+    print(
+        f"Processed {len(files_to_process)} of {len(files)} file(s), changed {num_changed}, "
+        f"skipped {len(files) - len(files_to_process)} unchanged since the last run."
+    )
+    if not args.no_cache:
+        args.cache.parent.mkdir(parents=True, exist_ok=True)
+        args.cache.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    if failed:
         sys.exit(1)
 
-    template_file = Path(sys.argv[1])
-    remove_ap_version_from_template(template_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/bin/env python
+"""Generate multiworlds with random Brotato options, to find option combinations which fail or are slow to generate.
+
+Each sample is a multiworld with one or more Brotato slots, each with its own options picked uniformly at random from
+the full range of every option in options.py: any value in a Range, any choice of a Choice or Toggle, and any subset of
+an OptionSet. Archipelago's common options, like local_items, are left at their defaults. Every sample is generated
+completely, including fill, in a process pool, and the following are reported:
+
+    * The 50th, 95th and 99th percentile of the generation time per slot.
+    * The peak RSS of the largest worker process, i.e. the most memory a single generation needed.
+
+Some random combinations are invalid, like a starting character mode which needs a DLC that isn't enabled, and the
+world rejects them on purpose by raising an OptionError. These are counted separately, and aren't failures.
+
+Samples are saved as YAMLs, with a comment saying which seed to use, if generating them raised any other exception or if
+any slot had no room for nonessential items (i.e. num_nonessential_items was clamped to 0 in generate_early). Exits with
+a non-zero status if any sample raised an exception other than OptionError.
+
+The options and seed of each sample are derived from "-s/--seed", so running this again with the same arguments tries
+the same combinations.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just stress_generation".
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import traceback
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import yaml
+from brotato_multiworld import GAME, GENERATION_STEPS, create_multiworld, run_steps
+from Fill import distribute_items_restrictive
+from Options import Choice, OptionError, OptionSet, Range, Toggle
+from worlds.AutoWorld import call_all
+from worlds.brotato import BrotatoWorld
+from worlds.brotato import options as brotato_options
+from worlds.brotato.generation_plan import get_generation_plan
+from worlds.brotato.options import BrotatoOptions
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument(
+    "-n", "--samples", type=int, default=200, help="The number of multiworlds to generate. Defaults to 200."
+)
+parser.add_argument(
+    "-p", "--players", type=int, default=1, help="The number of Brotato slots in each multiworld. Defaults to 1."
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="The number of processes to generate with. Defaults to the number of CPUs (%(default)s).",
+)
+parser.add_argument(
+    "-s", "--seed", type=int, default=0x7A70, help="Seeds the options and multiworlds. Defaults to %(default)s."
+)
+parser.add_argument(
+    "-o",
+    "--output-dir",
+    type=Path,
+    default=Path(".stress"),
+    help="Where to save the YAMLs of failing samples. Defaults to %(default)s.",
+)
+
+
+class SampleResult(NamedTuple):
+    index: int
+    seed: int
+    player_options: list[dict[str, Any]]
+    elapsed_ns: int
+    error: str | None
+    """The traceback of the exception generation raised, if any, other than an OptionError."""
+    rejected: str | None
+    """The message of the OptionError generation raised if the options were invalid, if any."""
+    clamped_players: list[int]
+    """The slots where there were more essential items than locations, so there were no nonessential items."""
+
+
+def random_option_value(option: type, rng: random.Random) -> Any:
+    """Pick a random valid value for the option, in the form a YAML would give it."""
+    if issubclass(option, Range):
+        return rng.randint(option.range_start, option.range_end)
+    if issubclass(option, Choice | Toggle):
+        return rng.choice(sorted(option.name_lookup))
+    if issubclass(option, OptionSet):
+        return sorted(key for key in sorted(option.valid_keys) if rng.random() < 0.5)
+    raise TypeError(f"Don't know how to pick a value for {option.__name__}.")
+
+
+def random_options(rng: random.Random) -> dict[str, Any]:
+    """Pick random values for every Brotato option. Options common to all games are left out, using their defaults."""
+    return {
+        name: random_option_value(option, rng)
+        for name, option in BrotatoOptions.type_hints.items()
+        if option.__module__ == brotato_options.__name__
+    }
+
+
+def get_clamped_players(worlds: Sequence[BrotatoWorld]) -> list[int]:
+    clamped_players: list[int] = []
+    for world in worlds:
+        # Cached from generate_early, so this is only a lookup.
+        plan = get_generation_plan(world.config)
+        if plan.num_locations <= plan.num_essential_items:
+            clamped_players.append(world.player)
+    return clamped_players
+
+
+def generate(index: int, seed: int, player_options: list[dict[str, Any]]) -> SampleResult:
+    """Generate and fill a multiworld like Archipelago's Main.py would, and create the slot data."""
+    clamped_players: list[int] = []
+    error: str | None = None
+    rejected: str | None = None
+    start = time.perf_counter_ns()
+    try:
+        multiworld = create_multiworld(player_options, seed)
+        run_steps(multiworld, ["generate_early"])
+        clamped_players = get_clamped_players(multiworld.get_game_worlds(GAME))  # type: ignore
+        run_steps(multiworld, GENERATION_STEPS[1:])
+        distribute_items_restrictive(multiworld)
+        call_all(multiworld, "post_fill")
+        if not multiworld.can_beat_game():
+            raise RuntimeError("The filled multiworld can't be beaten.")
+        for world in multiworld.worlds.values():
+            world.fill_slot_data()
+    except OptionError as oe:
+        rejected = str(oe)
+    except Exception:
+        error = traceback.format_exc()
+    return SampleResult(index, seed, player_options, time.perf_counter_ns() - start, error, rejected, clamped_players)
+
+
+def save_sample(result: SampleResult, output_dir: Path) -> Path:
+    """Save the sample's options as a YAML which can be generated with Archipelago's Generate.py."""
+    reason = "error" if result.error else "clamped"
+    path = output_dir / f"sample_{result.index}_{reason}.yaml"
+    documents = [
+        {"name": f"Brotato{player}", "game": GAME, GAME: options}
+        for player, options in enumerate(result.player_options, start=1)
+    ]
+    header = [f"# Generate with seed {result.seed}."]
+    if result.error:
+        header += [f"# {line}" for line in result.error.rstrip().splitlines()]
+    if result.clamped_players:
+        header.append(f"# No nonessential items for players {result.clamped_players}.")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        f.write("\n".join(header) + "\n")
+        yaml.safe_dump_all(documents, f, sort_keys=False)
+    return path
+
+
+def get_peak_rss_mib() -> float | None:
+    """The peak RSS of the largest finished worker process, in MiB. Must be called after the pool shuts down."""
+    if resource is None:
+        return None
+    # Reported in KiB on Linux, but bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def main() -> None:
+    args = parser.parse_args()
+    if args.samples < 2:
+        parser.error("Need at least 2 samples to calculate percentiles.")
+
+    rng = random.Random(args.seed)
+    samples = [
+        (index, rng.getrandbits(64), [random_options(rng) for _ in range(args.players)])
+        for index in range(args.samples)
+    ]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = list(executor.map(generate, *zip(*samples, strict=True)))
+    elapsed = time.perf_counter() - start
+    peak_rss_mib = get_peak_rss_mib()
+
+    num_errors = 0
+    num_clamped = 0
+    num_rejected = sum(result.rejected is not None for result in results)
+    for result in results:
+        if result.error or result.clamped_players:
+            path = save_sample(result, args.output_dir)
+            num_errors += result.error is not None
+            num_clamped += bool(result.clamped_players)
+            print(f"Sample {result.index}: {'error' if result.error else 'clamped'}, saved to {path}")
+
+    # Rejected samples stop early, so they'd make generation look faster than it is.
+    per_slot_ms = [r.elapsed_ns / 1_000_000 / args.players for r in results if r.error is None and r.rejected is None]
+    print(f"Generated {args.samples} multiworlds with {args.players} Brotato slot(s) each in {elapsed:.2f} s.")
+    if len(per_slot_ms) > 1:
+        percentiles = statistics.quantiles(per_slot_ms, n=100)
+        print(
+            f"Time per slot: p50 {percentiles[49]:.2f} ms, p95 {percentiles[94]:.2f} ms, "
+            f"p99 {percentiles[98]:.2f} ms, max {max(per_slot_ms):.2f} ms."
+        )
+    if peak_rss_mib is not None:
+        print(f"Peak RSS of a worker: {peak_rss_mib:.1f} MiB.")
+    print(
+        f"{num_errors} sample(s) raised an exception, {num_rejected} had invalid options, "
+        f"{num_clamped} had no nonessential items."
+    )
+    if num_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/bin/env python
+"""Check that player YAMLs with Brotato options can be generated, without generating a multiworld.
+
+Some option combinations are only rejected by BrotatoWorld.generate_early, like having no valid starting characters or
+setting every item weight to 0. Normally these only show up when the whole room is generated. This rolls each Brotato
+slot's options like Archipelago's Generate.py does, then runs the checks generate_early does that only depend on the
+options (see generation_plan.py), without creating a MultiWorld, regions or items.
+
+The YAMLs are checked in parallel, and every failure is reported at the end instead of stopping at the first one. Exits
+with a non-zero status if any YAML failed. Documents for other games are skipped.
+
+Options with random values are rolled once by default. Use "-r/--rolls" to roll each YAML several times, to catch
+combinations which only fail sometimes.
+
+This needs the Archipelago source on the PYTHONPATH, which is easiest done with "just validate_yamls".
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from Generate import read_weights_yamls, roll_settings
+from worlds.brotato import BrotatoWorld
+from worlds.brotato.config import BrotatoConfig
+from worlds.brotato.generation_plan import get_generation_plan
+from worlds.brotato.item_weights import sample_items_from_weights
+from worlds.brotato.options import BrotatoOptions
+
+YAML_SUFFIXES: tuple[str, ...] = (".yaml", ".yml")
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("paths", nargs="+", type=Path, help="YAML files, or directories to check every YAML in.")
+parser.add_argument(
+    "-r", "--rolls", type=int, default=1, help="How many times to roll the options of each YAML. Defaults to 1."
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="The number of processes to check YAMLs with. Defaults to the number of CPUs (%(default)s).",
+)
+
+
+class YamlResult(NamedTuple):
+    path: Path
+    num_slots: int
+    """The number of Brotato slots checked, counting each roll separately."""
+    failures: list[str]
+
+
+def find_yamls(paths: list[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix in YAML_SUFFIXES)
+        else:
+            yield path
+
+
+def is_brotato_yaml(weights: object) -> bool:
+    """Whether the YAML document could roll Brotato, either as its only game or one of its weighted games."""
+    if not isinstance(weights, dict):
+        return False
+    game = weights.get("game")
+    if isinstance(game, dict):
+        return game.get(BrotatoWorld.game, 0) > 0
+    return game == BrotatoWorld.game
+
+
+def check_options(options: BrotatoOptions) -> None:
+    """Run the parts of generate_early which can fail but don't need a MultiWorld. Raises OptionError on failure."""
+    plan = get_generation_plan(BrotatoConfig.from_options(options))
+    # Raises if every item weight is 0. The random doesn't matter, only the weights are checked.
+    sample_items_from_weights(plan.num_nonessential_items, random.Random(0), plan.item_names, plan.item_weights)
+
+
+def check_yaml(path: Path, num_rolls: int) -> YamlResult:
+    try:
+        documents = read_weights_yamls(str(path))
+    except Exception as ex:
+        return YamlResult(path, 0, [f"Could not read YAML: {type(ex).__name__}: {ex}"])
+
+    num_slots = 0
+    failures: list[str] = []
+    for doc_idx, weights in enumerate(documents):
+        if not is_brotato_yaml(weights):
+            continue
+        name = weights.get("name", "<no name>")
+        for roll in range(num_rolls):
+            # Seed each roll so a failure can be reproduced by running this again.
+            random.seed(f"{path}:{doc_idx}:{roll}")
+            try:
+                rolled = roll_settings(weights)
+                if rolled.game != BrotatoWorld.game:
+                    # The game is weighted, and this roll picked a different one.
+                    continue
+                num_slots += 1
+                options = BrotatoOptions(**{key: getattr(rolled, key) for key in BrotatoOptions.type_hints})
+                check_options(options)
+            except Exception as ex:
+                failures.append(f"document {doc_idx + 1} ({name}), roll {roll + 1}: {type(ex).__name__}: {ex}")
+    return YamlResult(path, num_slots, failures)
+
+
+def main() -> None:
+    args = parser.parse_args()
+    yaml_paths = list(find_yamls(args.paths))
+    if not yaml_paths:
+        parser.error("No YAML files found.")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = list(executor.map(check_yaml, yaml_paths, [args.rolls] * len(yaml_paths)))
+    elapsed = time.perf_counter() - start
+
+    num_slots = sum(r.num_slots for r in results)
+    failed_results = [r for r in results if r.failures]
+    for result in failed_results:
+        print(f"{result.path}:")
+        for failure in result.failures:
+            print(f"  {failure}")
+
+    num_failures = sum(len(r.failures) for r in failed_results)
+    print(
+        f"Checked {num_slots} Brotato slot(s) from {len(yaml_paths)} file(s) in {elapsed:.2f} s: "
+        f"{num_failures} failure(s) in {len(failed_results)} file(s)."
+    )
+    if failed_results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()